@@ -13,6 +13,15 @@ import string
 # Path to the database file
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'stemtubes.db')
 
+# get_all_users() result, reused briefly for admin page refreshes; cleared by
+# every write to the columns it returns
+USERS_CACHE_TTL = 5  # seconds
+_users_cache = None  # (users, cached_at)
+
+def _invalidate_users_cache():
+    global _users_cache
+    _users_cache = None
+
 def get_db_connection():
     """Get a connection to the SQLite database."""
     conn = sqlite3.connect(DB_PATH)
@@ -93,6 +102,7 @@ def create_user(username, password, email=None, is_admin=False):
             (username, password_hash, email, is_admin)
         )
         conn.commit()
+        _invalidate_users_cache()
         return True
     except sqlite3.IntegrityError:
         # Username already exists
@@ -152,6 +162,7 @@ def update_user(user_id, username=None, email=None, is_admin=None):
         
         conn.execute(query, params)
         conn.commit()
+        _invalidate_users_cache()
         return True
     except sqlite3.IntegrityError:
         # Username already exists
@@ -179,15 +190,44 @@ def delete_user(user_id):
     try:
         conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
         conn.commit()
+        _invalidate_users_cache()
         return True
     finally:
         conn.close()
 
 def get_all_users():
     """Get all users from the database."""
+    global _users_cache
+    cached = _users_cache
+    if cached and time.monotonic() - cached[1] < USERS_CACHE_TTL:
+        return list(cached[0])
+
     conn = get_db_connection()
     try:
         users = conn.execute('SELECT id, username, email, is_admin, youtube_enabled, created_at FROM users').fetchall()
+        users = [dict(user) for user in users]
+        _users_cache = (users, time.monotonic())
+        return list(users)
+    finally:
+        conn.close()
+
+def get_users_paginated(limit, offset=0):
+    """Get one page of users, ordered by username.
+
+    Args:
+        limit: Maximum number of users to return
+        offset: Number of users to skip
+
+    Returns:
+        List of user dicts (same fields as get_all_users)
+    """
+    conn = get_db_connection()
+    try:
+        users = conn.execute(
+            'SELECT id, username, email, is_admin, youtube_enabled, created_at FROM users '
+            'ORDER BY username LIMIT ? OFFSET ?',
+            (limit, offset)
+        ).fetchall()
         return [dict(user) for user in users]
     finally:
         conn.close()
@@ -206,6 +246,7 @@ def add_user(username, password, email=None, is_admin=False, youtube_enabled=Fal
             (username, password_hash, email, is_admin, youtube_enabled)
         )
         conn.commit()
+        _invalidate_users_cache()
         return True, "User created successfully"
     except Exception as e:
         print(f"Error adding user: {e}")
@@ -250,6 +291,7 @@ def update_user(user_id, username=None, email=None, is_admin=None, youtube_enabl
             query = f"UPDATE users SET {', '.join(updates)} WHERE id = ?"
             conn.execute(query, params)
             conn.commit()
+            _invalidate_users_cache()
 
         return True, "User updated successfully"
     except Exception as e:
@@ -274,6 +316,30 @@ def reset_user_password(user_id, new_password):
     finally:
         conn.close()
 
+def reset_admin_password_atomic(username='administrator'):
+    """Reset a user's password to a freshly generated one in a single transaction.
+
+    Args:
+        username: Account to reset (default: the built-in administrator)
+
+    Returns:
+        The new plain-text password, or None if the user does not exist
+    """
+    new_password = generate_secure_password()
+    password_hash = generate_password_hash(new_password)
+    conn = get_db_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        conn.execute('UPDATE users SET password_hash = ? WHERE id = ?', (password_hash, row['id']))
+        conn.commit()
+        return new_password
+    finally:
+        conn.close()
+
 def delete_user(user_id):
     """Delete a user from the database."""
     conn = get_db_connection()
@@ -292,6 +358,7 @@ def delete_user(user_id):
         # Delete user
         cursor = conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
         conn.commit()
+        _invalidate_users_cache()
         return True, "User deleted successfully"
     except Exception as e:
         print(f"Error deleting user: {e}")
@@ -312,6 +379,7 @@ def set_user_youtube_access(user_id, enabled):
             (1 if enabled else 0, user_id)
         )
         conn.commit()
+        _invalidate_users_cache()
         return True, "YouTube access updated successfully"
     except Exception as e:
         print(f"Error updating YouTube access: {e}")
@@ -19,12 +19,14 @@ else:
     BTC_AVAILABLE = False
     print(f"[BTC] Warning: BTC path not found at {BTC_PATH}")
 
-# Try to import BTC wrapper
+# Try to import BTC wrapper. The wrapper loads torch and the model modules
+# lazily, so load them here to find out whether detection can actually run
 if BTC_AVAILABLE:
     try:
-        from btc_wrapper import BTCChordDetector as BTCWrapper
+        from btc_wrapper import get_detector as get_btc_wrapper, ensure_model_deps
+        ensure_model_deps()
         print("[BTC] BTC wrapper imported successfully")
-    except ImportError as e:
+    except (ImportError, OSError) as e:
         BTC_AVAILABLE = False
         print(f"[BTC] Warning: Could not import BTC wrapper: {e}")
 
@@ -59,9 +61,10 @@ class BTCChordDetector:
         if not os.path.exists(self.btc_path):
             raise FileNotFoundError(f"BTC path not found: {self.btc_path}")
 
-        # Initialize BTC detector with large vocabulary (170 chords)
+        # Initialize BTC detector with large vocabulary (170 chords); the model
+        # is loaded once per process and shared between instances
         print(f"[BTC] Initializing detector from: {self.btc_path}")
-        self.detector = BTCWrapper(use_large_vocab=True)
+        self.detector = get_btc_wrapper(use_large_vocab=True)
         print("[BTC] ✓ Detector initialized with 170 chord vocabulary")
 
     def detect_chords(self, audio_file_path: str, bpm: Optional[float] = None) -> Tuple[Optional[str], float, List]:
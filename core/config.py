@@ -70,10 +70,15 @@ DEFAULT_SETTINGS = {
     "auto_check_updates": True,
     "extraction_timeout_minutes": 30,
     "extraction_progress_timeout_minutes": 5,
+    "debug_demucs_output": False,  # Echo every demucs output line to the console
+    "legacy_extraction_events": False,  # Also broadcast the old extraction_completed_global/extraction_refresh_needed events
     # Silent stem detection settings
     "enable_silent_stem_detection": True,  # Enable intelligent filtering of silent/empty stems
     "silent_stem_threshold_db": -40.0,     # dB threshold for silence detection
     "silent_stem_min_duration_ratio": 0.05,  # Minimum 5% active content required
+    "silence_use_ffmpeg": True,            # Use FFmpeg silencedetect (fast) instead of Python RMS analysis
+    # Stems ZIP: MP3 stems are always stored uncompressed; WAV stems use this deflate level (0 = store)
+    "zip_compression_level": 1,
     # Browser logging settings (disabled by default to prevent Ngrok rate limiting)
     "browser_logging_enabled": False,      # Disabled by default to prevent Ngrok rate limiting
     "browser_logging_level": "error",      # Minimum log level: debug, info, warn, error
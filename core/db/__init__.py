@@ -19,8 +19,8 @@ from core.db.connection import (
 from core.db.schema import init_table
 from core.db.downloads import (
     add_or_update, update_download_analysis, update_download_lyrics,
-    update_download_structure, find_global_download, add_user_access,
-    list_for, get_download_by_id, get_user_download_id_by_video_id,
+    update_download_structure, update_download_beats_only, find_global_download, add_user_access,
+    add_user_access_many, list_for, get_download_by_id, get_user_download_id_by_video_id,
     delete_from,
 )
 from core.db.extractions import (
@@ -31,7 +31,8 @@ from core.db.extractions import (
     set_user_extraction_in_progress, list_extractions_for,
 )
 from core.db.admin import (
-    get_all_downloads_for_admin, get_user_ids_for_video,
+    get_all_downloads_for_admin, get_downloads_by_video_id, get_download_by_video_id,
+    get_user_ids_for_video,
     delete_download_completely, reset_extraction_status,
     reset_extraction_status_by_video_id, get_storage_usage_stats,
 )
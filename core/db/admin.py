@@ -4,34 +4,66 @@ Admin-facing queries and bulk operations.
 from core.db.connection import _conn
 
 
+_ADMIN_DOWNLOAD_SELECT = """
+    SELECT
+        gd.id as global_id,
+        gd.video_id,
+        gd.title,
+        gd.file_path,
+        gd.media_type,
+        gd.quality,
+        gd.file_size,
+        gd.created_at,
+        gd.extracted,
+        gd.extraction_model,
+        gd.extracting,
+        gd.extracted_at,
+        COUNT(ud.id) as user_count,
+        GROUP_CONCAT(u.username, ', ') as users
+    FROM global_downloads gd
+    LEFT JOIN user_downloads ud ON gd.id = ud.global_download_id
+    LEFT JOIN users u ON ud.user_id = u.id
+"""
+
+
 def get_all_downloads_for_admin():
     """Return all downloads across all users for admin cleanup interface."""
     with _conn() as conn:
-        cur = conn.execute("""
-            SELECT
-                gd.id as global_id,
-                gd.video_id,
-                gd.title,
-                gd.file_path,
-                gd.media_type,
-                gd.quality,
-                gd.file_size,
-                gd.created_at,
-                gd.extracted,
-                gd.extraction_model,
-                gd.extracting,
-                gd.extracted_at,
-                COUNT(ud.id) as user_count,
-                GROUP_CONCAT(u.username, ', ') as users
-            FROM global_downloads gd
-            LEFT JOIN user_downloads ud ON gd.id = ud.global_download_id
-            LEFT JOIN users u ON ud.user_id = u.id
+        cur = conn.execute(_ADMIN_DOWNLOAD_SELECT + """
             GROUP BY gd.id
             ORDER BY gd.created_at DESC
         """)
         return [dict(row) for row in cur.fetchall()]
 
 
+def get_downloads_by_video_id(video_id):
+    """Return all global downloads for a video_id (every quality/media type),
+    newest first, in the same shape as get_all_downloads_for_admin().
+
+    The lookup uses the index behind UNIQUE(video_id, media_type, quality).
+    """
+    with _conn() as conn:
+        cur = conn.execute(_ADMIN_DOWNLOAD_SELECT + """
+            WHERE gd.video_id=?
+            GROUP BY gd.id
+            ORDER BY gd.created_at DESC
+        """, (video_id,))
+        return [dict(row) for row in cur.fetchall()]
+
+
+def get_download_by_video_id(video_id):
+    """Return the newest global download for a video_id, or None."""
+    with _conn() as conn:
+        cur = conn.execute(_ADMIN_DOWNLOAD_SELECT + """
+            WHERE gd.video_id=?
+            GROUP BY gd.id
+            ORDER BY gd.created_at DESC
+            LIMIT 1
+        """, (video_id,))
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+
 def get_user_ids_for_video(video_id):
     """Return distinct user IDs that have access to a given video."""
     with _conn() as conn:
@@ -185,6 +185,32 @@ def update_download_structure(video_id, structure_data):
             print(f"[STRUCTURE] Structure saved successfully for video_id='{video_id}'")
 
 
+def update_download_beats_only(video_id, beat_offset, beat_times, beat_positions):
+    """Update only the beat grid columns for a download, leaving other analysis intact."""
+    with _conn() as conn:
+        beat_times_json = json.dumps(beat_times) if beat_times else None
+        beat_positions_json = json.dumps(beat_positions) if beat_positions else None
+        params = (beat_offset, beat_times_json, beat_positions_json, video_id)
+
+        cursor = conn.execute("""
+            UPDATE global_downloads
+            SET beat_offset=?, beat_times=?, beat_positions=?
+            WHERE video_id=?
+        """, params)
+        rows_updated = cursor.rowcount
+
+        conn.execute("""
+            UPDATE user_downloads
+            SET beat_offset=?, beat_times=?, beat_positions=?
+            WHERE video_id=?
+        """, params)
+
+        conn.commit()
+
+        if rows_updated == 0:
+            print(f"[BEATS] WARNING: No rows updated! Video_id '{video_id}' not found")
+
+
 def find_global_download(video_id, media_type, quality):
     """Check if a download already exists globally."""
     with _conn() as conn:
@@ -218,6 +244,39 @@ def add_user_access(user_id, global_download):
         conn.commit()
 
 
+def add_user_access_many(user_ids, global_download):
+    """Give several users access to an existing global download in one transaction.
+
+    Returns:
+        Number of user_downloads rows actually inserted (existing rows are skipped).
+    """
+    rows = [
+        (
+            user_id,
+            global_download["id"],
+            global_download["video_id"],
+            global_download["title"],
+            global_download["thumbnail"],
+            global_download["file_path"],
+            global_download["media_type"],
+            global_download["quality"]
+        )
+        for user_id in user_ids
+    ]
+    if not rows:
+        return 0
+    with _conn() as conn:
+        before = conn.total_changes
+        conn.executemany("""
+            INSERT INTO user_downloads
+                (user_id, global_download_id, video_id, title, thumbnail, file_path, media_type, quality)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, video_id, media_type) DO NOTHING
+        """, rows)
+        conn.commit()
+        return conn.total_changes - before
+
+
 def list_for(user_id):
     """Return all downloads for a given user, newest first."""
     with _conn() as conn:
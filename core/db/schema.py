@@ -52,6 +52,13 @@ def init_table():
                 UNIQUE(user_id, video_id, media_type)
             )
         """)
+
+        # Per-download user lookups (admin views join user_downloads on this);
+        # global_downloads.video_id is already covered by its UNIQUE index
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_downloads_global_download_id
+            ON user_downloads(global_download_id)
+        """)
         conn.commit()
 
         # Add extraction fields to existing tables if they don't exist
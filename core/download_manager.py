@@ -108,6 +108,10 @@ class DownloadManager:
         self.on_download_complete: Optional[Callable[[str, str, str, Optional["DownloadItem"]], None]] = None
         self.on_download_error: Optional[Callable[[str, str], None]] = None
         self.on_download_start: Optional[Callable[[str], None]] = None
+        # Item bookkeeping: called when an item enters the manager and when it
+        # is removed from all of its collections
+        self.on_item_added: Optional[Callable[[DownloadItem], None]] = None
+        self.on_item_removed: Optional[Callable[[DownloadItem], None]] = None
     
     def add_download(self, item: DownloadItem) -> str:
         """Add a download to the queue.
@@ -120,6 +124,8 @@ class DownloadManager:
         """
         self.download_queue.put(item)
         self.queued_downloads[item.download_id] = item
+        if self.on_item_added:
+            self.on_item_added(item)
         return item.download_id
     
     def cancel_download(self, download_id: str) -> bool:
@@ -195,22 +201,13 @@ class DownloadManager:
         Returns:
             Download item or None if not found.
         """
-        # Check active downloads
-        if download_id in self.active_downloads:
-            return self.active_downloads[download_id]
-        
-        # Check completed downloads
-        if download_id in self.completed_downloads:
-            return self.completed_downloads[download_id]
-        
-        # Check failed downloads
-        if download_id in self.failed_downloads:
-            return self.failed_downloads[download_id]
-        
-        # Check queued downloads
-        if download_id in self.queued_downloads:
-            return self.queued_downloads[download_id]
-        
+        # Check active, completed, failed, then queued downloads
+        for downloads in (self.active_downloads, self.completed_downloads,
+                          self.failed_downloads, self.queued_downloads):
+            item = downloads.get(download_id)
+            if item is not None:
+                return item
+
         return None
     
     def get_all_downloads(self) -> Dict[str, List[DownloadItem]]:
@@ -248,10 +245,42 @@ class DownloadManager:
             keys_to_remove = [k for k, v in d.items() if v.video_id == video_id]
             for k in keys_to_remove:
                 print(f"[CLEANUP] Removing {video_id} from {name} downloads (key={k})")
-                del d[k]
+                item = d.pop(k)
                 removed = True
+                if self.on_item_removed:
+                    self.on_item_removed(item)
         return removed
 
+    def remove_download(self, download_id: str) -> bool:
+        """Remove a download from all internal dictionaries by download_id.
+
+        Args:
+            download_id: ID of the download to remove.
+
+        Returns:
+            True if the download was found and removed, False otherwise.
+        """
+        item = None
+        for d in (self.queued_downloads, self.active_downloads,
+                  self.failed_downloads, self.completed_downloads):
+            item = d.pop(download_id, None) or item
+        if item is None:
+            return False
+        if self.on_item_removed:
+            self.on_item_removed(item)
+        return True
+
+    def clear_downloads(self):
+        """Remove every download from the manager (queued, active, completed and failed)."""
+        items = []
+        for d in (self.queued_downloads, self.active_downloads,
+                  self.completed_downloads, self.failed_downloads):
+            items.extend(d.values())
+            d.clear()
+        if self.on_item_removed:
+            for item in items:
+                self.on_item_removed(item)
+
     def analyze_audio_with_librosa(self, audio_path: str) -> dict:
         """Analyzes audio file to detect BPM and key (Windows-compatible)."""
         try:
@@ -652,6 +681,29 @@ class DownloadManager:
 
                     # NOW run analysis - database entry exists for UPDATE
                     if item.download_type == DownloadType.AUDIO and item.file_path and os.path.exists(item.file_path):
+                        # Start the Musixmatch lookup first (network-bound) so it
+                        # overlaps with the local BPM/chord/structure analysis below
+                        lyrics_future = None
+                        lyrics_search_error = None
+                        artist = track = None
+                        try:
+                            from .metadata_extractor import extract_metadata
+                            from .syncedlyrics_client import fetch_lyrics_enhanced_async
+
+                            # Extract artist/track from title
+                            artist, track = extract_metadata(db_title=item.title)
+
+                            if artist and track:
+                                print(f"🎤 [DOWNLOAD] Searching Musixmatch lyrics for: {item.title}")
+                                # Only try Musixmatch (fast API call, no local processing)
+                                lyrics_future = fetch_lyrics_enhanced_async(
+                                    track_name=track,
+                                    artist_name=artist,
+                                    allow_plain=False  # Only word-level
+                                )
+                        except Exception as e:
+                            lyrics_search_error = e
+
                         print(f"🎵 [DOWNLOAD] Starting audio analysis for: {item.title}")
                         analysis_results = self.analyze_audio_with_librosa(item.file_path)
 
@@ -715,21 +767,12 @@ class DownloadManager:
                         # Whisper fallback will be done AFTER extraction with vocals.mp3 (better quality)
                         lyrics_data = None
                         try:
-                            from .metadata_extractor import extract_metadata
-                            from .syncedlyrics_client import fetch_lyrics_enhanced
+                            if lyrics_search_error is not None:
+                                raise lyrics_search_error
 
-                            print(f"🎤 [DOWNLOAD] Searching Musixmatch lyrics for: {item.title}")
-
-                            # Extract artist/track from title
-                            artist, track = extract_metadata(db_title=item.title)
-
-                            if artist and track:
-                                # Only try Musixmatch (fast API call, no local processing)
-                                synced_lyrics = fetch_lyrics_enhanced(
-                                    track_name=track,
-                                    artist_name=artist,
-                                    allow_plain=False  # Only word-level
-                                )
+                            if lyrics_future is not None:
+                                # Started before analysis; usually already finished by now
+                                synced_lyrics = lyrics_future.result()
 
                                 if synced_lyrics:
                                     lyrics_data = synced_lyrics
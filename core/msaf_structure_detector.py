@@ -7,11 +7,77 @@ without the previous multi-feature SSM and merging pipeline.
 """
 
 import os
+import time
+import hashlib
 import logging
+import tempfile
+import threading
+from contextlib import contextmanager
 from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# MSAF caches computed features in a single JSON file (msaf.config.features_tmp_file,
+# relative to the CWD by default). Point it at a per-audio-file cache instead so
+# repeated runs on the same song reuse features and concurrent runs don't clash.
+MSAF_FEATURES_CACHE_DIR = os.path.join(tempfile.gettempdir(), "stemtube_msaf_features")
+MSAF_FEATURES_CACHE_MAX_AGE = 7 * 24 * 3600  # 7 days
+MSAF_FEATURES_PRUNE_INTERVAL = 3600  # scan the cache directory at most hourly
+_msaf_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def _prune_features_cache():
+    """Delete cached feature files older than MSAF_FEATURES_CACHE_MAX_AGE."""
+    global _last_prune
+    now = time.time()
+    if now - _last_prune < MSAF_FEATURES_PRUNE_INTERVAL:
+        return
+    _last_prune = now
+
+    try:
+        entries = list(os.scandir(MSAF_FEATURES_CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and now - entry.stat().st_mtime > MSAF_FEATURES_CACHE_MAX_AGE:
+                os.remove(entry.path)
+        except OSError as exc:
+            logger.debug(f"[MSAF] Could not prune feature cache file {entry.path}: {exc}")
+
+
+def _features_cache_file(audio_path: str) -> str:
+    """Return the feature cache path for an audio file (keyed on path, size and mtime)."""
+    stat = os.stat(audio_path)
+    key = f"{os.path.abspath(audio_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return os.path.join(MSAF_FEATURES_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+@contextmanager
+def msaf_features_cache(audio_path: str):
+    """Run MSAF with its feature cache pointed at a per-file JSON.
+
+    The MSAF config is process-global, so the lock is held for the whole
+    body of the ``with`` block: all structure analysis in the process runs
+    one song at a time. Cache files older than MSAF_FEATURES_CACHE_MAX_AGE
+    are pruned on entry.
+    """
+    import msaf
+
+    with _msaf_lock:
+        previous = msaf.config.features_tmp_file
+        try:
+            os.makedirs(MSAF_FEATURES_CACHE_DIR, exist_ok=True)
+            _prune_features_cache()
+            msaf.config.features_tmp_file = _features_cache_file(audio_path)
+        except OSError as exc:
+            logger.debug(f"[MSAF] Feature cache unavailable, using default: {exc}")
+        try:
+            yield
+        finally:
+            msaf.config.features_tmp_file = previous
+
 
 def detect_song_structure_msaf(
     audio_path: str,
@@ -46,12 +112,13 @@ def detect_song_structure_msaf(
         logger.info(f"[MSAF] Running structure analysis with boundaries_id={boundaries_id}, "
                     f"labels_id={labels_id}")
 
-        boundaries, labels = msaf.process(
-            audio_path,
-            boundaries_id=boundaries_id,
-            labels_id=labels_id,
-            plot=False
-        )
+        with msaf_features_cache(audio_path):
+            boundaries, labels = msaf.process(
+                audio_path,
+                boundaries_id=boundaries_id,
+                labels_id=labels_id,
+                plot=False
+            )
 
         if boundaries is None or len(boundaries) < 2:
             logger.warning("[MSAF] Not enough boundaries detected.")
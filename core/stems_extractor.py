@@ -3,28 +3,306 @@ Stems extractor for StemTubes application.
 Handles extraction of audio stems using Demucs models.
 """
 import os
+import re
+import errno
 import time
 import threading
 import queue
+import select
 from typing import Dict, List, Optional, Callable, Any, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import tempfile
+import zipfile
+import zlib
 import subprocess
 import shutil
 import platform
 import sys
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import torch
-import torchaudio
-from demucs.pretrained import get_model
-from demucs.apply import apply_model
-from demucs.separate import load_track
-import librosa
 import numpy as np
 
 from .config import get_setting, STEM_MODELS, MODELS_DIR, get_ffmpeg_path, ensure_valid_downloads_directory, get_compatible_models, get_fallback_model
 
+# Resolved once at import instead of per extraction
+_IS_WINDOWS = platform.system() == "Windows"
+_PATH_SEP = ";" if _IS_WINDOWS else ":"
+
+# Matches the percentage in demucs/tqdm progress lines (e.g. " 42%|####      | 12.3/29.1")
+# Matched against raw stdout bytes; float() accepts the bytes group directly
+_PROGRESS_RE = re.compile(rb'(\d+(?:\.\d+)?)\s*%')
+_LINE_SPLIT_RE = re.compile(rb'[\r\n]')
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Parsers for ffmpeg silencedetect/volumedetect output (stderr)
+_FFMPEG_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+_FFMPEG_SILENCE_START_RE = re.compile(r'silence_start: (-?\d+(?:\.\d+)?)')
+_FFMPEG_SILENCE_DURATION_RE = re.compile(r'silence_duration: (\d+(?:\.\d+)?)')
+_FFMPEG_MEAN_VOLUME_RE = re.compile(r'mean_volume: (-?(?:\d+(?:\.\d+)?|inf)) dB')
+
+# Progress notifications are throttled: emit only after this much progress
+# (percent) or this much time (seconds) since the last emitted update
+_PROGRESS_EMIT_MIN_DELTA = 1.0
+_PROGRESS_EMIT_MIN_INTERVAL = 0.25
+
+# Buffer size for the userspace copy fallback and max bytes per sendfile call
+_COPY_BUFFER_SIZE = 1024 * 1024
+_SENDFILE_CHUNK_SIZE = 1 << 30
+
+
+def _cuda_available() -> bool:
+    """Check CUDA availability without requiring torch at import time.
+
+    Demucs runs in a subprocess (wrap_demucs.py), so this process only needs
+    torch to decide which device to pass on the command line.
+    """
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=4)
+def _build_demucs_env(ffmpeg_path: str) -> Tuple[str, Dict[str, str]]:
+    """Build the environment used to run demucs with FFmpeg on the PATH.
+
+    Cached per FFmpeg path so the environment copy and the ``ffmpeg -version``
+    check run once per process rather than on every extraction. Callers must
+    not mutate the returned environment.
+
+    Args:
+        ffmpeg_path: Configured FFmpeg path.
+
+    Returns:
+        Tuple of the resolved FFmpeg executable path and the environment dict.
+    """
+    ffmpeg_dir = os.path.dirname(ffmpeg_path)
+
+    # Ensure we have the correct ffmpeg path with ffmpeg.exe at the end on Windows
+    if _IS_WINDOWS and not ffmpeg_path.endswith("ffmpeg.exe"):
+        ffmpeg_path = os.path.join(ffmpeg_path, "ffmpeg.exe")
+
+    # Print FFmpeg information before setting up environment
+    print(f"FFmpeg path: {ffmpeg_path}")
+    print(f"FFmpeg exists: {os.path.exists(ffmpeg_path)}")
+
+    # Configure environment variables for FFmpeg
+    env = os.environ.copy()
+
+    # Add FFmpeg directory to PATH and set FFMPEG_PATH
+    if os.path.exists(ffmpeg_dir):
+        env["PATH"] = ffmpeg_dir + _PATH_SEP + env.get("PATH", "")
+
+        # Set explicit FFMPEG_PATH environment variable directly to the ffmpeg executable
+        env["FFMPEG_PATH"] = ffmpeg_path
+        print(f"Using FFmpeg at: {ffmpeg_path}")
+        print(f"PATH environment: {env['PATH']}")
+
+        # Verify FFmpeg is accessible
+        try:
+            result = subprocess.run(
+                [ffmpeg_path, "-version"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                check=False
+            )
+            if result.returncode == 0:
+                print(f"FFmpeg verification successful: {result.stdout.splitlines()[0]}")
+            else:
+                print(f"FFmpeg verification failed: {result.stderr}")
+        except Exception as e:
+            print(f"Error verifying FFmpeg: {e}")
+    else:
+        print(f"FFmpeg directory not found: {ffmpeg_dir}")
+
+    return ffmpeg_path, env
+
+
+def _fadvise(fd: int, *advice: str):
+    """Apply posix_fadvise hints to a whole file where supported (no-op elsewhere).
+
+    Args:
+        fd: Open file descriptor.
+        *advice: Names of ``os.POSIX_FADV_*`` constants.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for name in advice:
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, name))
+        except (OSError, AttributeError):
+            pass
+
+
+def _copy_file_fast(src: str, dst: str):
+    """Copy a file using the cheapest mechanism available.
+
+    Tries a hardlink first (same filesystem, no data copied), then CopyFileW on
+    Windows or the kernel-side os.sendfile on Linux, and finally a
+    readinto loop over a reusable 1 MiB buffer.
+
+    Args:
+        src: Source file path.
+        dst: Destination file path.
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        # Cross-device link, unsupported filesystem, or dst exists
+        pass
+
+    if _IS_WINDOWS:
+        try:
+            import ctypes
+            if ctypes.windll.kernel32.CopyFileW(src, dst, False):
+                return
+        except Exception:
+            pass
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        # The source is read once, front to back: ask for aggressive readahead
+        _fadvise(fsrc.fileno(), 'POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED')
+        try:
+            if hasattr(os, 'sendfile') and not _IS_WINDOWS:
+                try:
+                    offset = 0
+                    while True:
+                        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, _SENDFILE_CHUNK_SIZE)
+                        if sent == 0:
+                            break
+                        offset += sent
+                    return
+                except OSError:
+                    # e.g. macOS only supports sockets as sendfile destination
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+
+            buffer = bytearray(_COPY_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                read = fsrc.readinto(buffer)
+                if not read:
+                    break
+                fdst.write(view[:read])
+        finally:
+            # Source pages won't be read again; the destination stays cached
+            # for the silence analysis that follows
+            _fadvise(fsrc.fileno(), 'POSIX_FADV_DONTNEED')
+
+
+def _move_or_copy(src: str, dst: str):
+    """Move a file, falling back to a fast copy across filesystems.
+
+    Used for demucs output, which lives in a temp dir that is removed after
+    finalization, so renaming is safe and avoids a pass over every byte.
+
+    Args:
+        src: Source file path.
+        dst: Destination file path.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _copy_file_fast(src, dst)
+
+
+# Audio formats that are already compressed; deflating them wastes CPU for ~0% gain
+_COMPRESSED_AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac')
+
+
+def _deflate_file(file_path: str, level: int) -> Tuple[bytes, int, int]:
+    """Raw-deflate a file in memory for a ZIP entry.
+
+    zlib releases the GIL while compressing, so several files can be deflated
+    concurrently from a thread pool.
+
+    Returns:
+        Tuple of compressed data, CRC-32 and uncompressed size.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    chunks = []
+    crc = 0
+    size = 0
+    with open(file_path, 'rb') as f:
+        while True:
+            data = f.read(_COPY_BUFFER_SIZE)
+            if not data:
+                break
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+            chunks.append(compressor.compress(data))
+    chunks.append(compressor.flush())
+    return b''.join(chunks), crc, size
+
+
+def _write_precompressed_entry(zipf: zipfile.ZipFile, file_path: str, blob: bytes, crc: int, size: int):
+    """Append an already-deflated file to an open ZIP archive.
+
+    Mirrors what ZipFile.write does after compression, since zipfile has no
+    public API for writing pre-compressed data.
+    """
+    info = zipfile.ZipInfo.from_file(file_path, os.path.basename(file_path))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.CRC = crc
+    info.file_size = size
+    info.compress_size = len(blob)
+
+    zipf._writecheck(info)
+    zipf._didModify = True
+    info.header_offset = zipf.fp.tell()
+    zipf.fp.write(info.FileHeader())
+    zipf.fp.write(blob)
+    zipf.filelist.append(info)
+    zipf.NameToInfo[info.filename] = info
+    zipf.start_dir = zipf.fp.tell()
+
+
+def write_stems_zip(zip_path: str, file_paths: List[str]) -> str:
+    """Write stem files into a ZIP archive.
+
+    Already-compressed audio is stored as-is; other files (WAV) are deflated
+    at the ``zip_compression_level`` setting (0 stores everything). When
+    several files need deflating they are compressed in parallel.
+
+    Args:
+        zip_path: Destination ZIP path.
+        file_paths: Stem files to add (stored under their basename).
+
+    Returns:
+        The ZIP path.
+    """
+    level = get_setting("zip_compression_level", 1)
+    to_deflate = [file_path for file_path in file_paths
+                  if level and not file_path.lower().endswith(_COMPRESSED_AUDIO_EXTENSIONS)]
+
+    precompressed = {}
+    if len(to_deflate) > 1:
+        with ThreadPoolExecutor(max_workers=min(6, len(to_deflate))) as pool:
+            results = pool.map(_deflate_file, to_deflate, [level] * len(to_deflate))
+            precompressed = dict(zip(to_deflate, results))
+
+    with zipfile.ZipFile(zip_path, 'w', allowZip64=True) as zipf:
+        for file_path in file_paths:
+            if file_path in precompressed:
+                _write_precompressed_entry(zipf, file_path, *precompressed[file_path])
+            elif file_path in to_deflate:
+                zipf.write(file_path, os.path.basename(file_path),
+                           compress_type=zipfile.ZIP_DEFLATED, compresslevel=level)
+            else:
+                zipf.write(file_path, os.path.basename(file_path), compress_type=zipfile.ZIP_STORED)
+
+    return zip_path
+
 
 class ExtractionStatus(Enum):
     """Enum for extraction status."""
@@ -35,9 +313,13 @@ class ExtractionStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionItem:
-    """Class representing an extraction item."""
+    """Class representing an extraction item.
+
+    Uses __slots__ since many completed/failed items are retained per session;
+    arbitrary attributes cannot be attached (read optional ones with getattr).
+    """
     audio_path: str
     model_name: str
     output_dir: str
@@ -52,6 +334,10 @@ class ExtractionItem:
     zip_path: str = None
     video_id: str = ""  # Add video_id for deduplication and persistence
     title: str = ""     # Add title for better database records
+    # Last progress notification actually sent (see StemsExtractor._on_extraction_progress)
+    _last_emitted_progress: float = field(default=-1.0, init=False, repr=False)
+    _last_emitted_time: float = field(default=0.0, init=False, repr=False)
+    _last_emitted_status: Optional[str] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         """Generate a unique extraction ID if not provided and initialize output_paths."""
@@ -75,9 +361,8 @@ class StemsExtractor:
         self.running_processes: Dict[str, subprocess.Popen] = {}  # Track running subprocesses
 
         # Check if GPU is available
-        self.device = torch.device("cuda" if torch.cuda.is_available() and
-                                  get_setting("use_gpu_for_extraction", True) else "cpu")
-        self.using_gpu = self.device.type == "cuda"
+        self.device = "cuda" if _cuda_available() and get_setting("use_gpu_for_extraction", True) else "cpu"
+        self.using_gpu = self.device == "cuda"
 
         # Create models directory if it doesn't exist
         os.makedirs(MODELS_DIR, exist_ok=True)
@@ -97,11 +382,93 @@ class StemsExtractor:
         self.on_extraction_complete: Optional[Callable[[str], None]] = None
         self.on_extraction_error: Optional[Callable[[str, str, str], None]] = None  # extraction_id, error, video_id
         self.on_extraction_start: Optional[Callable[[str], None]] = None
+        # Item bookkeeping: called when an item enters the extractor and when it
+        # is removed from all of its collections
+        self.on_item_added: Optional[Callable[[ExtractionItem], None]] = None
+        self.on_item_removed: Optional[Callable[[ExtractionItem], None]] = None
+        self.on_item_cancelled: Optional[Callable[[ExtractionItem], None]] = None
+
+    @staticmethod
+    def _is_meaningful_content(active_ratio: float, overall_db: float, threshold_db: float, min_duration_ratio: float) -> bool:
+        """Decide whether RMS statistics describe meaningful (non-silent) audio."""
+        # Consider content meaningful if:
+        # 1. More than min_duration_ratio of frames are above threshold, OR
+        # 2. Overall RMS is significantly above threshold (for sustained quiet instruments)
+        return bool(
+            active_ratio > min_duration_ratio or
+            overall_db > (threshold_db + 10)  # Overall level within 10dB of threshold
+        )
+
+    @staticmethod
+    def _load_mono_audio(audio_path: str) -> Tuple[np.ndarray, int]:
+        """Load an audio file as mono float32 at its native sample rate.
+
+        Uses soundfile (libsndfile decodes WAV/FLAC and, since 1.1, MP3) and
+        only falls back to librosa/audioread when soundfile cannot read it.
+        """
+        try:
+            import soundfile as sf
+            data, sr = sf.read(audio_path, dtype='float32', always_2d=True)
+            y = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+            return np.ascontiguousarray(y), sr
+        except Exception:
+            # Imported lazily: librosa pulls in numba/scipy/audioread
+            import librosa
+            y, sr = librosa.load(audio_path, sr=None)
+            return y.astype(np.float32, copy=False), sr
+
+    def _ffmpeg_silence_stats(self, audio_path: str, threshold_db: float) -> Optional[Tuple[float, float]]:
+        """Measure active ratio and overall level with FFmpeg in a single pass.
+
+        Runs the silencedetect and volumedetect filters natively, which is far
+        faster than decoding into Python for long stems.
+
+        Args:
+            audio_path: Path to the audio file to analyze
+            threshold_db: dB threshold below which audio is considered silent
+
+        Returns:
+            Tuple of (active_ratio, overall_db), or None if FFmpeg failed.
+        """
+        ffmpeg_path, env = _build_demucs_env(get_ffmpeg_path())
+        cmd = [
+            ffmpeg_path, '-hide_banner', '-nostdin', '-i', audio_path,
+            '-af', f'silencedetect=n={threshold_db}dB:d=0.5,volumedetect',
+            '-f', 'null', '-'
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, errors='replace', env=env, check=False)
+        output = result.stderr
+
+        duration_match = _FFMPEG_DURATION_RE.search(output)
+        volume_match = _FFMPEG_MEAN_VOLUME_RE.search(output)
+        if result.returncode != 0 or not duration_match or not volume_match:
+            return None
+
+        hours, minutes, seconds = duration_match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        if duration <= 0:
+            return None
+
+        total_silence = sum(float(d) for d in _FFMPEG_SILENCE_DURATION_RE.findall(output))
+        # A silence running to EOF may be reported without a matching silence_end
+        starts = _FFMPEG_SILENCE_START_RE.findall(output)
+        ends = _FFMPEG_SILENCE_DURATION_RE.findall(output)
+        if len(starts) > len(ends):
+            total_silence += max(0.0, duration - float(starts[-1]))
+
+        active_ratio = max(0.0, 1.0 - total_silence / duration)
+        overall_db = float(volume_match.group(1))
+        return active_ratio, overall_db
 
     def _analyze_audio_content(self, audio_path: str, threshold_db: float = -40.0, min_duration_ratio: float = 0.05) -> bool:
         """
         Analyze audio file to determine if it contains meaningful content.
 
+        Uses FFmpeg's silencedetect/volumedetect filters when the
+        ``silence_use_ffmpeg`` setting is enabled, falling back to frame RMS
+        in numpy.
+
         Args:
             audio_path: Path to the audio file to analyze
             threshold_db: dB threshold below which audio is considered silent (default: -40dB)
@@ -111,38 +478,37 @@ class StemsExtractor:
             True if audio contains meaningful content, False if mostly silent/empty
         """
         try:
-            # Load audio file with librosa
-            y, sr = librosa.load(audio_path, sr=None)
-
-            # Convert threshold from dB to amplitude
-            threshold_amplitude = 10 ** (threshold_db / 20)
+            stats = None
+            if get_setting("silence_use_ffmpeg", True):
+                try:
+                    stats = self._ffmpeg_silence_stats(audio_path, threshold_db)
+                except Exception as e:
+                    print(f"FFmpeg silence detection failed for {audio_path}, using RMS analysis: {e}")
 
-            # Calculate RMS energy for each frame
-            frame_length = int(0.1 * sr)  # 100ms frames
-            hop_length = frame_length // 4
-            rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
+            if stats is not None:
+                active_ratio, overall_db = stats
+            else:
+                y, sr = self._load_mono_audio(audio_path)
 
-            # Count frames above threshold
-            active_frames = np.sum(rms > threshold_amplitude)
-            total_frames = len(rms)
+                # Convert threshold from dB to amplitude
+                threshold_amplitude = 10 ** (threshold_db / 20)
 
-            if total_frames == 0:
-                return False
+                # Calculate RMS energy for each frame over a strided view (no copies)
+                frame_length = int(0.1 * sr)  # 100ms frames
+                hop_length = frame_length // 4
+                if len(y) < frame_length:
+                    return False
+                frames = np.lib.stride_tricks.sliding_window_view(y, frame_length)[::hop_length]
+                rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
 
-            # Calculate ratio of active content
-            active_ratio = active_frames / total_frames
+                # Calculate ratio of active content
+                active_ratio = float(np.count_nonzero(rms > threshold_amplitude)) / len(rms)
 
-            # Also check overall RMS level
-            overall_rms = np.sqrt(np.mean(y**2))
-            overall_db = 20 * np.log10(overall_rms + 1e-10)  # Add small epsilon to avoid log(0)
+                # Also check overall RMS level
+                overall_rms = np.sqrt(np.dot(y, y) / len(y))
+                overall_db = 20 * np.log10(overall_rms + 1e-10)  # Add small epsilon to avoid log(0)
 
-            # Consider content meaningful if:
-            # 1. More than min_duration_ratio of frames are above threshold, OR
-            # 2. Overall RMS is significantly above threshold (for sustained quiet instruments)
-            has_meaningful_content = (
-                active_ratio > min_duration_ratio or
-                overall_db > (threshold_db + 10)  # Overall level within 10dB of threshold
-            )
+            has_meaningful_content = self._is_meaningful_content(active_ratio, overall_db, threshold_db, min_duration_ratio)
 
             print(f"Audio analysis for {os.path.basename(audio_path)}: "
                   f"Active ratio: {active_ratio:.3f}, Overall dB: {overall_db:.1f}, "
@@ -179,6 +545,8 @@ class StemsExtractor:
         
         self.queued_extractions[item.extraction_id] = item
         self.extraction_queue.put(item)
+        if self.on_item_added:
+            self.on_item_added(item)
         return item.extraction_id
     
     def cancel_extraction(self, extraction_id: str) -> bool:
@@ -217,6 +585,8 @@ class StemsExtractor:
             # Move from active to failed so retry/delete can find it
             del self.active_extractions[extraction_id]
             self.failed_extractions[extraction_id] = item
+            if self.on_item_cancelled:
+                self.on_item_cancelled(item)
             
             return True
         
@@ -234,10 +604,67 @@ class StemsExtractor:
                     temp_items.append(queued_item)
             for queued_item in temp_items:
                 self.extraction_queue.put(queued_item)
+            if self.on_item_cancelled:
+                self.on_item_cancelled(item)
             return True
         
         return False
     
+    def remove_extraction(self, extraction_id: str) -> bool:
+        """Remove an extraction from all internal dictionaries by extraction_id.
+
+        Args:
+            extraction_id: ID of the extraction to remove.
+
+        Returns:
+            True if the extraction was found and removed, False otherwise.
+        """
+        item = None
+        for d in (self.failed_extractions, self.completed_extractions,
+                  self.active_extractions, self.queued_extractions):
+            item = d.pop(extraction_id, None) or item
+        if item is None:
+            return False
+        if self.on_item_removed:
+            self.on_item_removed(item)
+        return True
+
+    def remove_extraction_by_video_id(self, video_id: str) -> bool:
+        """Remove every extraction for a video_id from all internal dictionaries.
+
+        Args:
+            video_id: The YouTube video ID to remove.
+
+        Returns:
+            True if any extractions were removed, False otherwise.
+        """
+        removed = False
+        dicts = {
+            'queued': self.queued_extractions,
+            'active': self.active_extractions,
+            'failed': self.failed_extractions,
+            'completed': self.completed_extractions
+        }
+        for name, d in dicts.items():
+            keys_to_remove = [k for k, v in d.items() if v.video_id == video_id]
+            for k in keys_to_remove:
+                print(f"[CLEANUP] Removing {video_id} from {name} extractions (key={k})")
+                item = d.pop(k)
+                removed = True
+                if self.on_item_removed:
+                    self.on_item_removed(item)
+        return removed
+
+    def clear_extractions(self):
+        """Remove active, completed and failed extractions (queued ones are kept)."""
+        items = []
+        for d in (self.active_extractions, self.completed_extractions, self.failed_extractions):
+            items.extend(d.values())
+            d.clear()
+        if self.on_item_removed:
+            for item in items:
+                self.on_item_removed(item)
+
     def get_extraction_status(self, extraction_id: str) -> Optional[ExtractionItem]:
         """Get the status of an extraction.
         
@@ -267,6 +694,9 @@ class StemsExtractor:
     
     def get_all_extractions(self) -> Dict[str, List[ExtractionItem]]:
         """Get all extractions.
+
+        Each call snapshots every status dict, so callers should fetch this
+        once per request rather than inside a loop.
         
         Returns:
             Dictionary with active, queued, completed, and failed extractions.
@@ -278,6 +708,19 @@ class StemsExtractor:
             "failed": list(self.failed_extractions.values())
         }
     
+    def get_extraction_counts(self) -> Dict[str, int]:
+        """Get the number of extractions in each status without copying them.
+
+        Returns:
+            Dictionary with active, queued, completed, and failed counts.
+        """
+        return {
+            "active": len(self.active_extractions),
+            "queued": len(self.queued_extractions),
+            "completed": len(self.completed_extractions),
+            "failed": len(self.failed_extractions)
+        }
+    
     def get_current_extraction(self) -> Optional[Dict[str, Any]]:
         """Get the currently active extraction.
         
@@ -371,12 +814,59 @@ class StemsExtractor:
         # Update progress
         item.progress = progress
 
+        # Coalesce: demucs and the per-stem loops report far more often than the
+        # UI needs. Emit on >= 1% change, a new status message, completion, or
+        # after a short quiet interval.
+        now = time.time()
+        if (progress - item._last_emitted_progress < _PROGRESS_EMIT_MIN_DELTA
+                and progress < 99.9
+                and status_message == item._last_emitted_status
+                and now - item._last_emitted_time < _PROGRESS_EMIT_MIN_INTERVAL):
+            return
+        item._last_emitted_progress = progress
+        item._last_emitted_time = now
+        item._last_emitted_status = status_message
+
         # Notify progress listeners - pass item data to avoid lookup issues in background threads
         if self.on_extraction_progress:
             status = status_message if status_message else "Extracting stems"
             # Pass video_id and title directly so callback doesn't need to look up the item
             self.on_extraction_progress(extraction_id, progress, status, item.video_id, item.title)
     
+    def _finalize_one_stem(self, stem: str, track_dir: str, item: ExtractionItem,
+                           silence_params: Optional[Tuple[float, float]]) -> Tuple[str, Optional[str], bool]:
+        """Move one demucs stem to the output directory and analyze its content.
+
+        Args:
+            stem: Stem name (e.g. "vocals").
+            track_dir: Demucs output directory for the track.
+            item: Extraction item.
+            silence_params: (threshold_db, min_duration_ratio) for silent stem
+                detection, or None if detection is disabled.
+
+        Returns:
+            Tuple of stem name, output path (None if demucs produced no file)
+            and whether the stem has meaningful content.
+        """
+        for ext in ("mp3", "wav"):
+            stem_file = os.path.join(track_dir, f"{stem}.{ext}")
+            if not os.path.exists(stem_file):
+                continue
+
+            output_file = os.path.join(item.output_dir, f"{stem}.{ext}")
+            _move_or_copy(stem_file, output_file)
+
+            # Analyze audio content to determine if it's meaningful (if feature is enabled)
+            if silence_params is not None:
+                has_meaningful_content = self._analyze_audio_content(output_file, *silence_params)
+            else:
+                # If analysis is disabled, include all stems
+                has_meaningful_content = True
+
+            return stem, output_file, has_meaningful_content
+
+        return stem, None, False
+
     def _extraction_thread(self, item: ExtractionItem):
         """Thread for extracting stems.
         
@@ -390,54 +880,9 @@ class StemsExtractor:
             temp_dir = tempfile.mkdtemp(prefix="demucs_extraction_", dir=system_temp_dir)
 
             try:
-                # Get FFmpeg path for setting environment variables
-                ffmpeg_path = get_ffmpeg_path()
-                ffmpeg_dir = os.path.dirname(ffmpeg_path)
-                
-                # Ensure we have the correct ffmpeg path with ffmpeg.exe at the end on Windows
-                if platform.system() == "Windows" and not ffmpeg_path.endswith("ffmpeg.exe"):
-                    ffmpeg_path = os.path.join(ffmpeg_path, "ffmpeg.exe")
-                    
-                # Print FFmpeg information before setting up environment
-                print(f"FFmpeg path: {ffmpeg_path}")
-                print(f"FFmpeg exists: {os.path.exists(ffmpeg_path)}")
-
-                # Configure environment variables for FFmpeg
-                env = os.environ.copy()
-                
-                # Add FFmpeg directory to PATH and set FFMPEG_PATH
-                if os.path.exists(ffmpeg_dir):
-                    # On Windows, PATH separator is semicolon
-                    if platform.system() == "Windows":
-                        env["PATH"] = ffmpeg_dir + ";" + env.get("PATH", "")
-                    else:
-                        # On Unix-like systems, PATH separator is colon
-                        env["PATH"] = ffmpeg_dir + ":" + env.get("PATH", "")
-                    
-                    # Set explicit FFMPEG_PATH environment variable directly to the ffmpeg executable
-                    env["FFMPEG_PATH"] = ffmpeg_path
-                    print(f"Using FFmpeg at: {ffmpeg_path}")
-                    print(f"PATH environment: {env['PATH']}")
-                    
-                    # Verify FFmpeg is accessible
-                    try:
-                        result = subprocess.run(
-                            [ffmpeg_path, "-version"],
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            env=env,
-                            check=False
-                        )
-                        if result.returncode == 0:
-                            print(f"FFmpeg verification successful: {result.stdout.splitlines()[0]}")
-                        else:
-                            print(f"FFmpeg verification failed: {result.stderr}")
-                    except Exception as e:
-                        print(f"Error verifying FFmpeg: {e}")
-                else:
-                    print(f"FFmpeg directory not found: {ffmpeg_dir}")
-                
+                # FFmpeg-aware environment (built and verified once per FFmpeg path)
+                ffmpeg_path, env = _build_demucs_env(get_ffmpeg_path())
+
                 # Instead of running demucs directly, use our wrapper script
                 # to ensure environment variables are correctly set
                 cmd = [
@@ -452,7 +897,7 @@ class StemsExtractor:
                 ]
                 
                 # Add device (GPU or CPU)
-                if self.device.type == 'cuda':
+                if self.device == 'cuda':
                     cmd.extend(['-d', 'cuda'])
                 else:
                     cmd.extend(['-d', 'cpu'])
@@ -461,37 +906,11 @@ class StemsExtractor:
                 if item.two_stem_mode and item.primary_stem:
                     cmd.extend(['--two-stems', item.primary_stem])
                 
-                # Add audio file at the end (use the temporary file if available)
-                temp_audio_path = None
-                try:
-                    # Get the extension of the original file
-                    _, ext = os.path.splitext(item.audio_path)
-                    
-                    # Create a temporary file with a simple name
-                    temp_audio_path = os.path.join(temp_dir, f"input{ext}")
-                    
-                    # Verify that the source directory exists
-                    if not os.path.exists(item.audio_path):
-                        raise FileNotFoundError(f"Source audio file not found: {item.audio_path}")
-                    
-                    # Copy the audio file to the temporary file
-                    print(f"Copying audio file to temporary location: {temp_audio_path}")
-                    shutil.copy2(item.audio_path, temp_audio_path)
-                    
-                    # Use the temporary file for extraction
-                    audio_path_for_extraction = temp_audio_path
-                    print(f"Using temporary audio file: {audio_path_for_extraction}")
-                except Exception as e:
-                    print(f"Error creating temporary audio file: {e}")
-                    # In case of error, use the original file but with quotes
-                    audio_path_for_extraction = item.audio_path
-                    print(f"Falling back to original audio file: {audio_path_for_extraction}")
-                
-                # Add audio file to the command
-                if temp_audio_path and os.path.exists(temp_audio_path):
-                    cmd.append(temp_audio_path)
-                else:
-                    cmd.append(audio_path_for_extraction)
+                # Add audio file at the end. Popen receives an argument list, so
+                # the original path is passed as-is without copying it to temp_dir
+                if not os.path.exists(item.audio_path):
+                    raise FileNotFoundError(f"Source audio file not found: {item.audio_path}")
+                cmd.append(item.audio_path)
                 
                 # Print the command for debugging
                 print(f"Running command: {' '.join(cmd)}")
@@ -501,21 +920,21 @@ class StemsExtractor:
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
+                    bufsize=0,  # Raw bytes; read in chunks below
                     env=env  # Use the environment with FFmpeg configured
                 )
+                stdout_fd = process.stdout.fileno()
+                pending = bytearray()
                 
                 # Store the process reference for cancellation
                 self.running_processes[item.extraction_id] = process
                 
-                # Store output lines for error reporting
-                output_lines = []
+                # Keep only the tail of the (undecoded) output for error reporting
+                # so memory stays constant regardless of extraction length
+                output_lines = deque(maxlen=200)
+                debug_demucs_output = get_setting("debug_demucs_output", False)
                 
                 # Process output to update progress with timeout safeguards
-                import time
-                import select
                 last_progress_time = time.time()
 
                 # Get configurable timeouts with model-specific adjustments
@@ -540,7 +959,9 @@ class StemsExtractor:
 
                 extraction_start_time = time.time()
                 last_progress_value = 0
-                stuck_progress_count = 0
+
+                # select() only works on pipes on POSIX; Windows falls back to polling
+                use_select = not _IS_WINDOWS
 
                 while True:
                     # Check timeouts
@@ -571,18 +992,24 @@ class StemsExtractor:
                         break
 
                     # Check if process has finished
-                    if process.poll() is not None:
-                        # Read any remaining output
-                        remaining_output = process.stdout.read()
-                        if remaining_output:
-                            output_lines.extend(remaining_output.split('\n'))
-                        break
+                    finished = process.poll() is not None
 
-                    # Read output with timeout
+                    # Read raw output with timeout; only lines that are kept or
+                    # printed get decoded
                     try:
-                        line = process.stdout.readline()
-                        if not line:
-                            # No more output, but process still running - check progress timeout
+                        if finished:
+                            # Drain remaining output; the newline flushes a partial last line
+                            chunk = (process.stdout.read() or b'') + b'\n'
+                        elif use_select:
+                            # Wait for output (up to 1s) so the timeout/cancel checks
+                            # above keep running without a busy sleep loop
+                            readable, _, _ = select.select([stdout_fd], [], [], 1.0)
+                            chunk = os.read(stdout_fd, _READ_CHUNK_SIZE) if readable else None
+                        else:
+                            chunk = os.read(stdout_fd, _READ_CHUNK_SIZE)
+
+                        if not chunk:
+                            # No output, but process still running - check progress timeout
                             if current_time - last_progress_time > progress_timeout:
                                 print(f"❌ No progress for {progress_timeout} seconds, terminating")
                                 process.terminate()
@@ -592,43 +1019,47 @@ class StemsExtractor:
                                     process.kill()
                                     process.wait()
                                 raise TimeoutError(f"No progress for {progress_timeout} seconds")
-                            time.sleep(0.1)  # Small delay before checking again
+                            if chunk is not None:
+                                time.sleep(0.1)  # stdout closed, waiting for the process to exit
                             continue
 
-                        output_line = line.strip()
-                        if output_line:
-                            print(f"Demucs output: {output_line}")
+                        # tqdm redraws its bar with '\r', so split on both terminators
+                        # and keep the trailing partial line for the next chunk
+                        pending += chunk
+                        lines = _LINE_SPLIT_RE.split(pending)
+                        pending = bytearray(lines.pop())
+
+                        progress_match = None
+                        for raw_line in lines:
+                            output_line = raw_line.strip()
+                            if not output_line:
+                                continue
                             output_lines.append(output_line)
+                            if debug_demucs_output:
+                                print(f"Demucs output: {output_line.decode('utf-8', errors='replace')}")
+                            match = _PROGRESS_RE.search(output_line)
+                            if match:
+                                progress_match = match
+
+                        # Update progress from the latest tick in this chunk
+                        if progress_match:
+                            # Don't cap at 90% - allow full progress
+                            progress_value = float(progress_match.group(1))
+
+                            # Only meaningful forward progress resets the progress timeout
+                            # (demucs restarts its bar per shift, so reset on drops too)
+                            if progress_value > last_progress_value + 0.5 or progress_value < last_progress_value:
+                                last_progress_time = current_time
+                                last_progress_value = progress_value
+
+                            # Scale demucs 0-100% to overall 0-45% range
+                            item.progress = min(progress_value * 0.45, 45.0)
+
+                            # Notify progress
+                            self._on_extraction_progress(item.extraction_id, item.progress)
 
-                        # Update progress based on output
-                        if '%' in line:
-                            try:
-                                # Try to parse progress percentage
-                                percent_str = line.split('%')[0].split('|')[-1].strip()
-                                if ':' in percent_str:
-                                    percent_str = percent_str.split(':')[-1].strip()
-
-                                # Don't cap at 90% - allow full progress
-                                progress_value = float(percent_str)
-
-                                # Check for stuck progress
-                                if abs(progress_value - last_progress_value) < 0.1:
-                                    stuck_progress_count += 1
-                                    if stuck_progress_count > 50:  # Same progress 50 times
-                                        print(f"⚠️ Progress appears stuck at {progress_value}%")
-                                        # Continue but don't timeout yet - Demucs can be slow
-                                else:
-                                    stuck_progress_count = 0
-                                    last_progress_time = current_time
-                                    last_progress_value = progress_value
-
-                                # Scale demucs 0-100% to overall 0-45% range
-                                item.progress = min(progress_value * 0.45, 45.0)
-
-                                # Notify progress
-                                self._on_extraction_progress(item.extraction_id, item.progress)
-                            except (ValueError, IndexError):
-                                pass
+                        if finished:
+                            break
 
                     except Exception as e:
                         print(f"Error reading process output: {e}")
@@ -662,7 +1093,8 @@ class StemsExtractor:
                 
                 if return_code != 0:
                     # Join the last 20 lines of output for error reporting
-                    error_output = "\n".join(output_lines[-20:]) if output_lines else "No output captured"
+                    error_output = (b"\n".join(list(output_lines)[-20:]).decode('utf-8', errors='replace')
+                                    if output_lines else "No output captured")
                     raise Exception(f"Demucs exited with code {return_code}. Output:\n{error_output}")
                 
                 # Finalization phase — progress continues from 45%
@@ -673,13 +1105,12 @@ class StemsExtractor:
                 if not os.path.exists(model_dir):
                     raise FileNotFoundError(f"Expected output directory not found: {model_dir}")
                 
-                # Find track directory (should be only one)
-                track_dirs = [d for d in os.listdir(model_dir) if os.path.isdir(os.path.join(model_dir, d))]
-                if not track_dirs:
+                # Find track directory (should be only one); scandir avoids a stat per entry
+                with os.scandir(model_dir) as entries:
+                    track_dir = next((e.path for e in entries if e.is_dir(follow_symlinks=False)), None)
+                if track_dir is None:
                     raise FileNotFoundError(f"No track directories found in {model_dir}")
                 
-                track_dir = os.path.join(model_dir, track_dirs[0])
-                
                 # Create output directory if it doesn't exist
                 os.makedirs(item.output_dir, exist_ok=True)
                 
@@ -695,65 +1126,48 @@ class StemsExtractor:
                 stems_to_process = item.selected_stems if item.selected_stems else default_stems
                 total_stems = len(stems_to_process)
 
-                for i, stem in enumerate(stems_to_process):
-                    # Update progress during file copying (from 45% to 48%)
-                    progress = 45.0 + (i / total_stems) * 3.0
-                    item.progress = progress
-                    self._on_extraction_progress(item.extraction_id, progress, f"Copying {stem}...")
-                    
-                    # Check if the stem is selected or if all stems are selected
-                    if not item.selected_stems or stem in item.selected_stems:
-                        stem_file_mp3 = os.path.join(track_dir, f"{stem}.mp3")
-                        stem_file_wav = os.path.join(track_dir, f"{stem}.wav")
-                        
-                        if os.path.exists(stem_file_mp3):
-                            output_file = os.path.join(item.output_dir, f"{stem}.mp3")
-                            shutil.copy2(stem_file_mp3, output_file)
-
-                            # Analyze audio content to determine if it's meaningful (if feature is enabled)
-                            if get_setting("enable_silent_stem_detection", True):
-                                threshold_db = get_setting("silent_stem_threshold_db", -40.0)
-                                min_duration_ratio = get_setting("silent_stem_min_duration_ratio", 0.05)
-                                has_meaningful_content = self._analyze_audio_content(output_file, threshold_db, min_duration_ratio)
-                            else:
-                                # If analysis is disabled, include all stems
-                                has_meaningful_content = True
-
-                            if has_meaningful_content:
-                                # Only include stems with meaningful content
-                                stem_files[stem] = output_file
-                                print(f"✓ Stem '{stem}' added to mixer (has meaningful content)")
-                            else:
-                                # Keep the file on disk for debugging but don't include in mixer
-                                print(f"✗ Stem '{stem}' excluded from mixer (mostly silent/empty)")
-
-                        elif os.path.exists(stem_file_wav):
-                            output_file = os.path.join(item.output_dir, f"{stem}.wav")
-                            shutil.copy2(stem_file_wav, output_file)
-
-                            # Analyze audio content to determine if it's meaningful (if feature is enabled)
-                            if get_setting("enable_silent_stem_detection", True):
-                                threshold_db = get_setting("silent_stem_threshold_db", -40.0)
-                                min_duration_ratio = get_setting("silent_stem_min_duration_ratio", 0.05)
-                                has_meaningful_content = self._analyze_audio_content(output_file, threshold_db, min_duration_ratio)
-                            else:
-                                # If analysis is disabled, include all stems
-                                has_meaningful_content = True
-
-                            if has_meaningful_content:
-                                # Only include stems with meaningful content
-                                stem_files[stem] = output_file
-                                print(f"✓ Stem '{stem}' added to mixer (has meaningful content)")
-                            else:
-                                # Keep the file on disk for debugging but don't include in mixer
-                                print(f"✗ Stem '{stem}' excluded from mixer (mostly silent/empty)")
+                # Move + analyze stems in parallel: moving is I/O-bound and the
+                # silence analysis spends most of its time in native decode/numpy
+                # code, so the stems overlap well on a small thread pool
+                # Read the silence settings once for all stems
+                silent_detection = get_setting("enable_silent_stem_detection", True)
+                silence_params = (
+                    get_setting("silent_stem_threshold_db", -40.0),
+                    get_setting("silent_stem_min_duration_ratio", 0.05),
+                ) if silent_detection else None
+
+                finalized = {}
+                with ThreadPoolExecutor(max_workers=min(6, total_stems) or 1) as pool:
+                    futures = [pool.submit(self._finalize_one_stem, stem, track_dir, item, silence_params)
+                               for stem in stems_to_process]
+                    for done_count, future in enumerate(as_completed(futures), start=1):
+                        stem, output_file, has_meaningful_content = future.result()
+                        finalized[stem] = (output_file, has_meaningful_content)
+
+                        # Update progress during file copying (from 45% to 48%)
+                        progress = 45.0 + (done_count / total_stems) * 3.0
+                        item.progress = progress
+                        self._on_extraction_progress(item.extraction_id, progress, "Copying stems...")
+
+                # Collect results in stem order so the mixer layout stays stable
+                for stem in stems_to_process:
+                    output_file, has_meaningful_content = finalized[stem]
+                    if output_file is None:
+                        continue
+                    if has_meaningful_content:
+                        # Only include stems with meaningful content
+                        stem_files[stem] = output_file
+                        print(f"✓ Stem '{stem}' added to mixer (has meaningful content)")
+                    else:
+                        # Keep the file on disk for debugging but don't include in mixer
+                        print(f"✗ Stem '{stem}' excluded from mixer (mostly silent/empty)")
                 
                 # Stems copied — lyrics + beat detection happen in extensions.py (48-97%)
                 item.progress = 48.0
                 self._on_extraction_progress(item.extraction_id, 48.0, "Finalizing...")
 
                 # Log stem analysis results
-                if get_setting("enable_silent_stem_detection", True):
+                if silent_detection:
                     print(f"Stem analysis complete: {len(stem_files)}/{total_stems} stems have meaningful content")
                 else:
                     print(f"Silent stem detection disabled - all {len(stem_files)} stems included")
@@ -855,6 +1269,8 @@ class StemsExtractor:
             raise ValueError(f"Model '{validated_model}' not found")
 
         try:
+            from demucs.pretrained import get_model
+
             # Load model
             model = get_model(validated_model)
             model.to(self.device)
@@ -872,7 +1288,7 @@ class StemsExtractor:
                     return self._load_model(fallback_model)
             raise e
     
-    def _load_audio(self, audio_path: str) -> Tuple[torch.Tensor, int]:
+    def _load_audio(self, audio_path: str) -> Tuple["torch.Tensor", int]:
         """Load audio from file.
         
         Args:
@@ -917,6 +1333,9 @@ class StemsExtractor:
                 # Continue with original file if conversion fails
         
         try:
+            import torchaudio
+            from demucs.separate import load_track
+
             # First load the audio to get the sample rate
             waveform, sample_rate = torchaudio.load(audio_path)
             
@@ -936,7 +1355,7 @@ class StemsExtractor:
         except Exception as e:
             raise Exception(f"Failed to load audio file: {e}")
     
-    def _extract_stems(self, model, audio: torch.Tensor, sr: int, item: ExtractionItem) -> Dict[str, torch.Tensor]:
+    def _extract_stems(self, model, audio: "torch.Tensor", sr: int, item: ExtractionItem) -> Dict[str, "torch.Tensor"]:
         """Extract stems from audio.
         
         Args:
@@ -948,6 +1367,9 @@ class StemsExtractor:
         Returns:
             Dictionary of stem name to audio tensor.
         """
+        import torch
+        from demucs.apply import apply_model
+
         # Get available stems for the model
         model_info = STEM_MODELS.get(item.model_name, {})
         available_stems = model_info.get("stems", [])
@@ -989,7 +1411,7 @@ class StemsExtractor:
         
         return stems
     
-    def _save_stems(self, stems: Dict[str, torch.Tensor], sr: int, item: ExtractionItem):
+    def _save_stems(self, stems: Dict[str, "torch.Tensor"], sr: int, item: ExtractionItem):
         """Save stems to files.
         
         Args:
@@ -997,12 +1419,20 @@ class StemsExtractor:
             sr: Sample rate.
             item: Extraction item.
         """
+        import torchaudio
+
         # Get base filename without extension
         base_name = os.path.splitext(os.path.basename(item.audio_path))[0]
         
         # Ensure output directory exists
         os.makedirs(item.output_dir, exist_ok=True)
         
+        # Read the silence settings once for all stems
+        silent_detection = get_setting("enable_silent_stem_detection", True)
+        if silent_detection:
+            threshold_db = get_setting("silent_stem_threshold_db", -40.0)
+            min_duration_ratio = get_setting("silent_stem_min_duration_ratio", 0.05)
+
         # Save each stem and analyze content
         analyzed_stems = {}
         for stem_name, audio in stems.items():
@@ -1013,9 +1443,7 @@ class StemsExtractor:
             torchaudio.save(output_path, audio.cpu(), sr)
 
             # Analyze audio content to determine if it's meaningful (if feature is enabled)
-            if get_setting("enable_silent_stem_detection", True):
-                threshold_db = get_setting("silent_stem_threshold_db", -40.0)
-                min_duration_ratio = get_setting("silent_stem_min_duration_ratio", 0.05)
+            if silent_detection:
                 has_meaningful_content = self._analyze_audio_content(output_path, threshold_db, min_duration_ratio)
             else:
                 # If analysis is disabled, include all stems
@@ -1030,7 +1458,7 @@ class StemsExtractor:
                 # Keep the file on disk for debugging but don't include in mixer
                 print(f"✗ Stem '{stem_name}' excluded from mixer (mostly silent/empty)")
 
-        if get_setting("enable_silent_stem_detection", True):
+        if silent_detection:
             print(f"Stem analysis complete: {len(analyzed_stems)}/{len(stems)} stems have meaningful content")
         else:
             print(f"Silent stem detection disabled - all {len(analyzed_stems)} stems included")
@@ -1054,16 +1482,11 @@ class StemsExtractor:
             Path to the created ZIP archive, or None if creation failed.
         """
         try:
-            import zipfile
-            
             # Create ZIP file path
             zip_path = os.path.join(item.output_dir, f"{base_name}_stems.zip")
             
             # Create ZIP file
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for stem_name, file_path in item.output_paths.items():
-                    # Add file to ZIP
-                    zipf.write(file_path, os.path.basename(file_path))
+            write_stems_zip(zip_path, list(item.output_paths.values()))
             
             print(f"Created ZIP archive: {zip_path}")
             return zip_path
@@ -1086,9 +1509,9 @@ class StemsExtractor:
             use_gpu: Whether to use GPU.
         """
         # Only update if there's a change and GPU is available
-        if use_gpu != self.using_gpu and torch.cuda.is_available():
+        if use_gpu != self.using_gpu and _cuda_available():
             self.using_gpu = use_gpu
-            self.device = torch.device("cuda" if use_gpu else "cpu")
+            self.device = "cuda" if use_gpu else "cpu"
             
             # Clear model cache to reload models on the new device
             self.models.clear()
@@ -6,8 +6,11 @@ Detects musical sections: intro, verse, chorus, bridge, solo, outro
 import os
 import msaf
 import logging
+import numpy as np
 from typing import List, Dict, Optional
 
+from .msaf_structure_detector import msaf_features_cache
+
 logger = logging.getLogger(__name__)
 
 # Mapping of MSAF labels to English section labels
@@ -74,37 +77,33 @@ class StructureDetector:
         try:
             logger.info(f"[STRUCTURE] Analyzing structure with {self.algorithm}...")
 
-            # Structure analysis with MSAF
-            boundaries, labels = msaf.process(
-                audio_path,
-                boundaries_id=self.boundaries_id,
-                labels_id=self.algorithm,
-                plot=False  # No visualization
-            )
+            # Structure analysis with MSAF. Features are cached per file, so the
+            # fallback algorithms in detect_with_multiple_algorithms reuse them
+            with msaf_features_cache(audio_path):
+                boundaries, labels = msaf.process(
+                    audio_path,
+                    boundaries_id=self.boundaries_id,
+                    labels_id=self.algorithm,
+                    plot=False  # No visualization
+                )
 
             if boundaries is None or len(boundaries) == 0:
                 logger.warning("[STRUCTURE] No boundaries detected")
                 return None
 
+            # Section labels (if available), mapped to standard labels
+            n_sections = len(boundaries) - 1
+            n_labels = min(n_sections, len(labels)) if labels is not None else 0
+            get_label = SECTION_LABELS.get
+            section_labels = [get_label(str(labels[i]).lower().strip(), f"Section {i+1}")
+                              for i in range(n_labels)]
+            section_labels += [f"Section {i+1}" for i in range(n_labels, n_sections)]
+
             # Building the sections list
-            sections = []
-            for i in range(len(boundaries) - 1):
-                start_time = float(boundaries[i])
-                end_time = float(boundaries[i + 1])
-
-                # Section label (if available)
-                if labels is not None and i < len(labels):
-                    raw_label = str(labels[i]).lower().strip()
-                    # Mapping to standard labels
-                    section_label = SECTION_LABELS.get(raw_label, f"Section {i+1}")
-                else:
-                    section_label = f"Section {i+1}"
-
-                sections.append({
-                    "start": start_time,
-                    "end": end_time,
-                    "label": section_label
-                })
+            sections = [
+                {"start": float(start), "end": float(end), "label": label}
+                for start, end, label in zip(boundaries[:-1], boundaries[1:], section_labels)
+            ]
 
             logger.info(f"[STRUCTURE] Detected {len(sections)} sections")
             return sections
@@ -160,63 +159,43 @@ class StructureDetector:
 
         enhanced = [s.copy() for s in sections]
 
+        # Durations and "still unlabeled" flags, computed once and kept in sync
+        durations = np.fromiter((s['end'] - s['start'] for s in enhanced), dtype=float, count=len(enhanced))
+        unlabeled = np.fromiter(('Section' in s['label'] for s in enhanced), dtype=bool, count=len(enhanced))
+
         # First section is often an intro if short
-        if len(enhanced) > 0:
-            first_duration = enhanced[0]['end'] - enhanced[0]['start']
-            if first_duration < 25 and 'Section' in enhanced[0]['label']:
-                enhanced[0]['label'] = 'Intro'
+        if durations[0] < 25 and unlabeled[0]:
+            enhanced[0]['label'] = 'Intro'
+            unlabeled[0] = False
 
         # Last section is often an outro
-        if len(enhanced) > 0:
-            last_duration = enhanced[-1]['end'] - enhanced[-1]['start']
-            if last_duration < 40 and 'Section' in enhanced[-1]['label']:
-                enhanced[0]['label'] = 'Outro'
-
-        # Group sections by similar duration (tolerance ±3 seconds)
-        duration_groups = {}
-        for i, section in enumerate(enhanced):
-            if 'Section' not in section['label']:
-                continue  # Skip already labeled sections
-
-            duration = section['end'] - section['start']
-
-            # Find an existing group with similar duration
-            found_group = False
-            for key_duration in list(duration_groups.keys()):
-                if abs(duration - key_duration) <= 3.0:  # 3 second tolerance
-                    duration_groups[key_duration].append((i, duration))
-                    found_group = True
-                    break
-
-            if not found_group:
-                duration_groups[duration] = [(i, duration)]
-
-        # Identify repeated patterns (verse/chorus)
-        # Sort groups by number of occurrences
-        sorted_groups = sorted(duration_groups.items(),
-                             key=lambda x: len(x[1]),
-                             reverse=True)
-
-        # Most repeated group (>= 2 occurrences) = likely verse or chorus
-        for group_duration, indices_durations in sorted_groups:
-            indices = [i for i, d in indices_durations]
-
-            if len(indices) >= 2:  # At least 2 repetitions
-                # Alternate between Verse and Chorus
-                for idx, section_idx in enumerate(sorted(indices)):
-                    if 'Section' in enhanced[section_idx]['label']:
-                        if idx % 2 == 0:
-                            enhanced[section_idx]['label'] = 'Verse'
-                        else:
-                            enhanced[section_idx]['label'] = 'Chorus'
+        if durations[-1] < 40 and unlabeled[-1]:
+            enhanced[-1]['label'] = 'Outro'
+            unlabeled[-1] = False
+
+        # Group unlabeled sections by similar duration (3 second buckets)
+        candidates = np.flatnonzero(unlabeled)
+        if len(candidates):
+            buckets = np.round(durations[candidates] / 3.0).astype(int)
+            _, group_ids, counts = np.unique(buckets, return_inverse=True, return_counts=True)
+
+            # Repeated durations (>= 2 occurrences) = likely verse or chorus,
+            # alternating in order of appearance within each group
+            seen = np.zeros(len(counts), dtype=int)
+            for section_idx, group in zip(candidates, group_ids):
+                if counts[group] < 2:
+                    continue
+                enhanced[section_idx]['label'] = 'Verse' if seen[group] % 2 == 0 else 'Chorus'
+                unlabeled[section_idx] = False
+                seen[group] += 1
 
         # Unidentified middle sections = potentially bridge or solo
         middle_start = len(enhanced) // 3
         middle_end = 2 * len(enhanced) // 3
 
         for i in range(middle_start, middle_end):
-            if 'Section' in enhanced[i]['label']:
-                duration = enhanced[i]['end'] - enhanced[i]['start']
+            if unlabeled[i]:
+                duration = durations[i]
                 # Short section in middle = probably a bridge
                 if duration < 20:
                     enhanced[i]['label'] = 'Bridge'
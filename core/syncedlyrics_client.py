@@ -5,12 +5,39 @@ This module uses the syncedlyrics library to fetch lyrics with word-level
 timestamps (Enhanced LRC format), eliminating the need for Whisper alignment.
 """
 
+import os
 import re
+import time
+import hashlib
 import logging
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Raw LRC responses are cached on disk per normalized query so retries and
+# re-processing of the same track skip the network round-trip
+LYRICS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "stemtube_lyrics")
+LYRICS_CACHE_MAX_AGE = 30 * 24 * 3600  # 30 days
+
+# Background pool for lyrics lookups (network-bound), see fetch_lyrics_enhanced_async
+_fetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="syncedlyrics")
+
+# LRC patterns (timestamps are always ASCII digits, so skip Unicode \d/\s tables)
+_LINE_TIME_RE = re.compile(r'^\[(\d{2}):(\d{2})\.(\d{2,3})\]', re.ASCII)
+_WORD_RE = re.compile(r'<(\d{2}):(\d{2})\.(\d{2,3})>\s*([^<\[\]]+)', re.ASCII)
+_STD_LINE_RE = re.compile(r'^\[(\d{2}):(\d{2})\.(\d{2,3})\]\s*(.+)$', re.ASCII)
+
+# Single-scan tokenizer for Enhanced LRC: a line timestamp (only at the start of
+# a line), a word timestamp with its text, or a line break
+_TOKEN_RE = re.compile(
+    r'^[^\S\n]*\[(\d{2}):(\d{2})\.(\d{2,3})\]'
+    r'|<(\d{2}):(\d{2})\.(\d{2,3})>[^\S\n]*([^<\[\]\n]+)'
+    r'|\n',
+    re.ASCII | re.MULTILINE
+)
+
 
 def parse_enhanced_lrc(lrc_content: str) -> List[Dict]:
     """
@@ -41,65 +68,60 @@ def parse_enhanced_lrc(lrc_content: str) -> List[Dict]:
         return []
 
     segments = []
-    lines = lrc_content.strip().split('\n')
 
-    # Regex patterns
-    line_time_pattern = re.compile(r'^\[(\d{2}):(\d{2})\.(\d{2,3})\]')
-    word_pattern = re.compile(r'<(\d{2}):(\d{2})\.(\d{2,3})>\s*([^<\[\]]+)')
+    def flush_line(texts, starts):
+        if not texts:
+            return
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Extract line start time
-        line_match = line_time_pattern.match(line)
-        if not line_match:
-            continue
+        # Each word ends when next word starts; the last word ends at next line
+        # start or +0.5s (we'll fix this in post-processing)
+        ends = starts[1:] + [starts[-1] + 0.5]
+        words = [{'word': t, 'start': st, 'end': e} for t, st, e in zip(texts, starts, ends)]
 
-        line_start = _parse_timestamp(line_match.group(1), line_match.group(2), line_match.group(3))
+        # Use first word's timestamp for segment start (not line_start)
+        # This ensures segment activation syncs with word highlighting
+        segments.append({
+            'start': starts[0],
+            'end': ends[-1],
+            'text': ' '.join(texts),
+            'words': words
+        })
 
-        # Extract all words with timestamps
-        words = []
-        for word_match in word_pattern.finditer(line):
-            word_start = _parse_timestamp(word_match.group(1), word_match.group(2), word_match.group(3))
-            word_text = word_match.group(4).strip()
+    # One regex scan over the whole body; lines without a leading timestamp
+    # (metadata tags, junk) are skipped. Words are collected as parallel
+    # text/start lists and only turned into dicts once per line.
+    in_line = False
+    texts = []
+    starts = []
+    for token in _TOKEN_RE.finditer(lrc_content):
+        if token.group(1) is not None:
+            # Line timestamp: start collecting words for this line
+            in_line = True
+            texts = []
+            starts = []
+        elif token.group(4) is not None:
+            if not in_line:
+                continue
+            minutes, seconds, ms, word_text = token.group(4, 5, 6, 7)
+            word_text = word_text.strip()
 
             # Skip empty or whitespace-only
             if not word_text:
                 continue
 
-            words.append({
-                'word': word_text,
-                'start': word_start,
-                'end': None  # Will be filled in next pass
-            })
-
-        if not words:
-            continue
+            texts.append(word_text)
+            # Inlined _parse_timestamp (2 digits = centiseconds, 3 = milliseconds)
+            starts.append(int(minutes) * 60 + int(seconds) + (int(ms) * 10 if len(ms) == 2 else int(ms)) / 1000.0)
+        else:
+            # End of line
+            if in_line:
+                flush_line(texts, starts)
+            in_line = False
+            texts = []
+            starts = []
 
-        # Calculate end times (each word ends when next word starts)
-        for i in range(len(words) - 1):
-            words[i]['end'] = words[i + 1]['start']
-
-        # Last word ends at next line start or +0.5s
-        # We'll fix this in post-processing
-        if words:
-            words[-1]['end'] = words[-1]['start'] + 0.5
-
-        # Build full text
-        text = ' '.join(w['word'] for w in words)
-
-        # Use first word's timestamp for segment start (not line_start)
-        # This ensures segment activation syncs with word highlighting
-        segment_start = words[0]['start'] if words else line_start
-
-        segments.append({
-            'start': segment_start,
-            'end': words[-1]['end'] if words else line_start,
-            'text': text,
-            'words': words
-        })
+    if in_line:
+        flush_line(texts, starts)
 
     # Post-process: fix last word end times using next segment start
     for i in range(len(segments) - 1):
@@ -130,6 +152,42 @@ def _parse_timestamp(minutes: str, seconds: str, milliseconds: str) -> float:
     return int(minutes) * 60 + int(seconds) + ms / 1000.0
 
 
+def _search_cached(syncedlyrics, query: str, enhanced: bool) -> Optional[str]:
+    """
+    syncedlyrics.search with an on-disk cache of successful results.
+
+    Args:
+        syncedlyrics: The imported syncedlyrics module
+        query: Search query
+        enhanced: Whether to request word-level (Enhanced LRC) lyrics
+
+    Returns:
+        Raw LRC string, or None if not found
+    """
+    key = hashlib.sha1(f"{' '.join(query.lower().split())}|{enhanced}".encode('utf-8')).hexdigest()
+    cache_file = os.path.join(LYRICS_CACHE_DIR, f"{key}.lrc")
+
+    try:
+        if time.time() - os.path.getmtime(cache_file) < LYRICS_CACHE_MAX_AGE:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                logger.info(f"[SYNCEDLYRICS] Using cached result for: {query}")
+                return f.read()
+    except OSError:
+        pass
+
+    result = syncedlyrics.search(query, enhanced=enhanced)
+
+    if result:
+        try:
+            os.makedirs(LYRICS_CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write(result)
+        except OSError as e:
+            logger.debug(f"[SYNCEDLYRICS] Could not write lyrics cache: {e}")
+
+    return result
+
+
 def fetch_lyrics_enhanced(
     track_name: str,
     artist_name: str = None,
@@ -162,9 +220,11 @@ def fetch_lyrics_enhanced(
 
     try:
         # Try enhanced (word-level) first
-        result = syncedlyrics.search(query, enhanced=True)
+        result = _search_cached(syncedlyrics, query, enhanced=True)
 
-        if result and '<' in result:  # Enhanced format has <timestamps>
+        # Enhanced format has <MM:SS.ms> word timestamps; a bare '<' (e.g. in
+        # metadata tags) is not enough to be worth a full word-level parse
+        if result and _WORD_RE.search(result) is not None:
             logger.info(f"[SYNCEDLYRICS] Found word-level lyrics ({len(result)} chars)")
             segments = parse_enhanced_lrc(result)
 
@@ -176,7 +236,7 @@ def fetch_lyrics_enhanced(
         # Fall back to line-level if allowed
         if allow_plain:
             logger.info("[SYNCEDLYRICS] No word-level found, trying line-level...")
-            result = syncedlyrics.search(query, enhanced=False)
+            result = _search_cached(syncedlyrics, query, enhanced=False)
 
             if result:
                 logger.info(f"[SYNCEDLYRICS] Found line-level lyrics ({len(result)} chars)")
@@ -191,6 +251,28 @@ def fetch_lyrics_enhanced(
         return None
 
 
+def fetch_lyrics_enhanced_async(
+    track_name: str,
+    artist_name: str = None,
+    allow_plain: bool = False
+) -> Future:
+    """
+    Start fetch_lyrics_enhanced on a background thread.
+
+    Lets callers overlap the network round-trip with local audio analysis and
+    collect the segments later with ``future.result()``.
+
+    Args:
+        track_name: Song title
+        artist_name: Artist name (optional but recommended)
+        allow_plain: If True, fall back to line-level if word-level unavailable
+
+    Returns:
+        Future resolving to the fetch_lyrics_enhanced result
+    """
+    return _fetch_executor.submit(fetch_lyrics_enhanced, track_name, artist_name, allow_plain)
+
+
 def _parse_standard_lrc(lrc_content: str) -> List[Dict]:
     """
     Parse standard LRC format (line-level timestamps only).
@@ -200,11 +282,10 @@ def _parse_standard_lrc(lrc_content: str) -> List[Dict]:
         return []
 
     segments = []
-    line_pattern = re.compile(r'^\[(\d{2}):(\d{2})\.(\d{2,3})\]\s*(.+)$')
 
     for line in lrc_content.strip().split('\n'):
         line = line.strip()
-        match = line_pattern.match(line)
+        match = _STD_LINE_RE.match(line)
 
         if match:
             timestamp = _parse_timestamp(match.group(1), match.group(2), match.group(3))
@@ -5,28 +5,98 @@ Uses energy/onset detection on vocals.mp3 to get precise timestamps
 for synchronizing with Musixmatch lyrics.
 """
 
+import os
+import json
+import hashlib
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    # numba is installed alongside librosa; JIT the sequential onset loops with it
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator: run the kernels as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Onset results are cached per vocals file (keyed on path, size, mtime and the
+# analysis parameters): in memory for the process and as JSON under the temp dir,
+# so re-syncing lyrics against the same stem skips the STFT entirely.
+ONSET_CACHE_DIR = os.path.join(tempfile.gettempdir(), "stemtube_onsets")
+_ONSET_MEMO_SIZE = 32
+_onset_memo: "OrderedDict[str, List[float]]" = OrderedDict()  # JSON-ready lists
+_onset_memo_lock = threading.Lock()
+
+
+def _onset_cache_key(vocals_path: str, hop_length: int, backtrack: bool, sr: int = 22050) -> str:
+    """Return the cache key for an onset analysis of a vocals file."""
+    stat = os.stat(vocals_path)
+    key = f"{os.path.abspath(vocals_path)}|{stat.st_size}|{stat.st_mtime_ns}|{hop_length}|{backtrack}|{sr}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _get_cached_onsets(cache_key: str) -> Optional[np.ndarray]:
+    """Look up cached onsets in memory, then on disk."""
+    with _onset_memo_lock:
+        if cache_key in _onset_memo:
+            _onset_memo.move_to_end(cache_key)
+            return np.array(_onset_memo[cache_key], dtype=np.float64)
+
+    try:
+        with open(os.path.join(ONSET_CACHE_DIR, f"{cache_key}.json"), 'r') as f:
+            onsets = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    _remember_onsets(cache_key, onsets)
+    return np.array(onsets, dtype=np.float64)
+
+
+def _remember_onsets(cache_key: str, onsets: List[float]):
+    """Store onsets in the in-memory LRU."""
+    with _onset_memo_lock:
+        _onset_memo[cache_key] = list(onsets)
+        _onset_memo.move_to_end(cache_key)
+        while len(_onset_memo) > _ONSET_MEMO_SIZE:
+            _onset_memo.popitem(last=False)
+
+
+def _store_cached_onsets(cache_key: str, onsets: List[float]):
+    """Store onsets in memory and on disk (disk failures are not fatal)."""
+    _remember_onsets(cache_key, onsets)
+    try:
+        os.makedirs(ONSET_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(ONSET_CACHE_DIR, f"{cache_key}.json"), 'w') as f:
+            json.dump(onsets, f)
+    except OSError as e:
+        logger.debug(f"[ONSET] Could not write onset cache: {e}")
+
 
 def detect_vocal_onsets(
     vocals_path: str,
-    hop_length: int = 512,
+    hop_length: int = 1024,
     backtrack: bool = True
-) -> Optional[List[float]]:
+) -> Optional[np.ndarray]:
     """
     Detect energy onsets in the vocal track.
 
     Args:
         vocals_path: Path to vocals.mp3 (isolated vocal stem)
-        hop_length: Hop length for analysis
+        hop_length: Hop length for analysis (1024 at 22.05kHz = ~46ms frames,
+            well under the 100ms onset gap used below)
         backtrack: Whether to backtrack to find true onset start
 
     Returns:
-        List of timestamps (seconds) where vocal energy starts, or None on error
+        Sorted float64 array of timestamps (seconds) where vocal energy starts,
+        or None on error
     """
     try:
         import librosa
@@ -35,10 +105,27 @@ def detect_vocal_onsets(
         return None
 
     try:
+        cache_key = _onset_cache_key(vocals_path, hop_length, backtrack)
+        cached = _get_cached_onsets(cache_key)
+        if cached is not None:
+            logger.info(f"[ONSET] Using cached onsets for {vocals_path} ({len(cached)} onsets)")
+            return cached
+
         logger.info(f"[ONSET] Loading vocals: {vocals_path}")
 
-        # Load audio
-        y, sr = librosa.load(vocals_path, sr=22050, mono=True)
+        # Load audio: decode with soundfile (WAV/FLAC, MP3 with libsndfile >= 1.1)
+        # and resample once; librosa.load falls back to audioread for the rest
+        try:
+            import soundfile as sf
+            y, sr = sf.read(vocals_path, dtype='float32', always_2d=False)
+            if y.ndim > 1:
+                y = y.mean(axis=1)
+            if sr != 22050:
+                y = librosa.resample(y, orig_sr=sr, target_sr=22050, res_type='soxr_hq')
+                sr = 22050
+        except Exception as e:
+            logger.debug(f"[ONSET] soundfile could not read vocals ({e}), using librosa.load")
+            y, sr = librosa.load(vocals_path, sr=22050, mono=True)
         duration = len(y) / sr
         logger.info(f"[ONSET] Audio loaded: {duration:.1f}s, sr={sr}")
 
@@ -46,6 +133,7 @@ def detect_vocal_onsets(
         # 1. Standard onset detection (spectral flux)
         onset_env = librosa.onset.onset_strength(
             y=y, sr=sr, hop_length=hop_length,
+            n_fft=2 * hop_length,  # Keep 50% frame overlap
             aggregate=np.median  # More robust to noise
         )
 
@@ -64,21 +152,18 @@ def detect_vocal_onsets(
         )
 
         # Filter: remove onsets that are too close together (< 100ms)
-        filtered_onsets = []
         min_gap = 0.1  # 100ms minimum between onsets
-
-        for t in onset_times:
-            if not filtered_onsets or (t - filtered_onsets[-1]) >= min_gap:
-                filtered_onsets.append(round(t, 3))
+        filtered_onsets = _dedup_onsets(np.asarray(onset_times, dtype=np.float64), min_gap)
 
         logger.info(f"[ONSET] Detected {len(filtered_onsets)} vocal onsets "
                     f"(filtered from {len(onset_times)})")
 
         # Log first few onsets for debugging
-        if filtered_onsets:
-            sample = filtered_onsets[:10]
+        if filtered_onsets.size:
+            sample = filtered_onsets[:10].tolist()
             logger.info(f"[ONSET] First onsets: {sample}")
 
+        _store_cached_onsets(cache_key, filtered_onsets.tolist())
         return filtered_onsets
 
     except Exception as e:
@@ -86,9 +171,83 @@ def detect_vocal_onsets(
         return None
 
 
+@njit(cache=True)
+def _dedup_onsets_kernel(onset_times: np.ndarray, min_gap: float) -> np.ndarray:
+    """
+    Return the indices of onsets at least min_gap after the previously kept
+    (millisecond-rounded) onset.
+    """
+    keep = np.empty(onset_times.shape[0], dtype=np.int64)
+    count = 0
+    last_kept = 0.0
+    for i in range(onset_times.shape[0]):
+        if count == 0 or onset_times[i] - last_kept >= min_gap:
+            keep[count] = i
+            count += 1
+            last_kept = round(onset_times[i], 3)
+    return keep[:count]
+
+
+def _dedup_onsets(onset_times: np.ndarray, min_gap: float) -> np.ndarray:
+    """
+    Keep onsets at least min_gap after the previously kept onset.
+
+    Args:
+        onset_times: Sorted onset times in seconds (float64)
+        min_gap: Minimum gap between kept onsets in seconds
+
+    Returns:
+        Kept onset times, rounded to milliseconds
+    """
+    return np.round(onset_times[_dedup_onsets_kernel(onset_times, min_gap)], 3)
+
+
+@njit(cache=True)
+def _match_words_kernel(word_starts: np.ndarray, onsets: np.ndarray,
+                        tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Greedily match each (offset-adjusted) word start to the closest unused onset.
+
+    Returns:
+        Tuple of per-word matched onset index (-1 if none within tolerance) and
+        per-word bracket index (first onset strictly after the word start).
+    """
+    n_words = word_starts.shape[0]
+    n_onsets = onsets.shape[0]
+    matched = np.full(n_words, -1, dtype=np.int64)
+    bracket = np.empty(n_words, dtype=np.int64)
+    used = np.zeros(n_onsets, dtype=np.bool_)
+
+    for w in range(n_words):
+        mm_start = word_starts[w]
+
+        # Bisect, then step outwards past used onsets on each side
+        # (ties go to the earlier onset)
+        insert_at = np.searchsorted(onsets, mm_start)
+        lo = insert_at - 1
+        hi = insert_at
+        while lo >= 0 and used[lo] and mm_start - onsets[lo] <= tolerance:
+            lo -= 1
+        while hi < n_onsets and used[hi] and onsets[hi] - mm_start <= tolerance:
+            hi += 1
+        lo_delta = mm_start - onsets[lo] if lo >= 0 and not used[lo] else np.inf
+        hi_delta = onsets[hi] - mm_start if hi < n_onsets and not used[hi] else np.inf
+
+        if lo_delta <= hi_delta and lo_delta <= tolerance:
+            matched[w] = lo
+            used[lo] = True
+        elif hi_delta < lo_delta and hi_delta <= tolerance:
+            matched[w] = hi
+            used[hi] = True
+
+        bracket[w] = np.searchsorted(onsets, mm_start, side='right')
+
+    return matched, bracket
+
+
 def calculate_global_offset(
     words: List[dict],
-    onsets: List[float],
+    onsets: np.ndarray,
     search_window: float = 5.0
 ) -> float:
     """
@@ -99,37 +258,28 @@ def calculate_global_offset(
 
     Args:
         words: List of word dicts with 'start' timestamps
-        onsets: List of onset timestamps
+        onsets: Onset timestamps, sorted ascending (array or list)
         search_window: Search range in seconds (offset can be -window to +window)
 
     Returns:
         Optimal offset in seconds (add to Musixmatch timestamps to align with audio)
     """
-    if not words or not onsets:
+    onsets = np.asarray(onsets, dtype=np.float64)
+    if not words or onsets.size == 0:
         return 0.0
 
-    # Get first meaningful word timestamp (skip instrumental intro in lyrics)
-    first_word_time = None
-    for w in words[:20]:  # Check first 20 words
-        if w.get('start', 0) > 0.5:  # Skip words at very start
-            first_word_time = w['start']
-            break
+    # Extract word starts once; everything below works on the array
+    starts = np.fromiter((w.get('start', 0.0) for w in words), dtype=np.float64, count=len(words))
 
-    if first_word_time is None:
-        first_word_time = words[0].get('start', 0)
+    # Get first meaningful word timestamp (skip instrumental intro in lyrics):
+    # first of the first 20 words past 0.5s
+    late_words = np.flatnonzero(starts[:20] > 0.5)
+    first_word_time = starts[late_words[0]] if late_words.size else starts[0]
 
-    # Get first significant onset (skip noise at very beginning)
-    first_onset_time = None
-    for onset in onsets[:30]:  # Check first 30 onsets
-        if onset > 1.0:  # Skip first second
-            first_onset_time = onset
-            break
-
-    if first_onset_time is None and onsets:
-        first_onset_time = onsets[0]
-
-    if first_onset_time is None:
-        return 0.0
+    # Get first significant onset (skip noise at very beginning):
+    # first of the first 30 onsets past 1s
+    late_onsets = np.flatnonzero(onsets[:30] > 1.0)
+    first_onset_time = onsets[late_onsets[0]] if late_onsets.size else onsets[0]
 
     # Simple offset: difference between first onset and first word
     simple_offset = first_onset_time - first_word_time
@@ -139,22 +289,23 @@ def calculate_global_offset(
     best_matches = 0
     tolerance = 0.15  # 150ms tolerance for match counting
 
-    # Test offsets around the simple estimate
-    for delta in np.arange(-1.0, 1.0, 0.05):
-        test_offset = simple_offset + delta
-        matches = 0
+    # Test offsets around the simple estimate, all at once:
+    # adjusted[k, w] = word start w shifted by candidate offset k
+    test_offsets = simple_offset + np.arange(-1.0, 1.0, 0.05)
+    adjusted = starts[None, :] + test_offsets[:, None]
 
-        for word in words:
-            adjusted_time = word['start'] + test_offset
-            # Check if any onset is close to this adjusted time
-            for onset in onsets:
-                if abs(onset - adjusted_time) < tolerance:
-                    matches += 1
-                    break
+    # A word matches if the nearest onset on either side is within tolerance
+    idx = np.searchsorted(onsets, adjusted)
+    last = len(onsets) - 1
+    dist_next = np.abs(onsets[np.minimum(idx, last)] - adjusted)
+    dist_prev = np.abs(onsets[np.maximum(idx - 1, 0)] - adjusted)
+    matches = np.count_nonzero(np.minimum(dist_next, dist_prev) < tolerance, axis=1)
 
-        if matches > best_matches:
-            best_matches = matches
-            best_offset = test_offset
+    # First candidate with the most matches (keep the simple estimate if none match)
+    best = int(np.argmax(matches))
+    if matches[best] > 0:
+        best_matches = int(matches[best])
+        best_offset = float(test_offsets[best])
 
     # Musixmatch timestamps are typically early or on-time, never late.
     # A negative offset would shift lyrics even earlier — always wrong.
@@ -169,7 +320,7 @@ def calculate_global_offset(
 
 def sync_words_with_onsets(
     words: List[dict],
-    onsets: List[float],
+    onsets: np.ndarray,
     tolerance_ms: float = 200,
     global_offset: float = 0.0
 ) -> List[dict]:
@@ -178,14 +329,15 @@ def sync_words_with_onsets(
 
     Args:
         words: List of word dicts with 'word', 'start', 'end' from Musixmatch
-        onsets: List of onset timestamps from vocal detection
+        onsets: Onset timestamps from vocal detection, sorted ascending (array or list)
         tolerance_ms: Maximum allowed difference to consider a match (ms)
         global_offset: Pre-calculated offset to apply to all words
 
     Returns:
         Words with corrected timestamps
     """
-    if not words or not onsets:
+    onsets = np.asarray(onsets, dtype=np.float64)
+    if not words or onsets.size == 0:
         return words
 
     tolerance = tolerance_ms / 1000.0  # Convert to seconds
@@ -193,83 +345,65 @@ def sync_words_with_onsets(
     matched_count = 0
     interpolated_count = 0
 
-    # Track used onsets to avoid double-matching
-    used_onsets = set()
+    # Apply global offset to Musixmatch timestamps, then match every word to
+    # its closest unused onset (and bracketing onsets) in one native pass
+    n_onsets = len(onsets)
+    mm_starts = np.fromiter((w.get('start', 0.0) for w in words), dtype=np.float64,
+                            count=len(words)) + global_offset
+    matched_idx, bracket_idx = _match_words_kernel(mm_starts, onsets, tolerance)
+    starts = np.empty(len(words), dtype=np.float64)  # synced starts, rounded in bulk below
 
     for i, word in enumerate(words):
         word_copy = word.copy()
+        mm_start = float(mm_starts[i])
+        best_idx = int(matched_idx[i])
 
-        # Apply global offset to Musixmatch timestamp
-        mm_start = word['start'] + global_offset
-        original_duration = word.get('end', mm_start + 0.2) - word['start']
-
-        # Find closest unused onset within tolerance
-        best_onset = None
-        best_delta = float('inf')
-
-        for onset in onsets:
-            if onset in used_onsets:
-                continue
-            delta = abs(onset - mm_start)
-            if delta < best_delta:
-                best_delta = delta
-                best_onset = onset
-
-        if best_onset is not None and best_delta <= tolerance:
+        if best_idx >= 0:
             # Direct match - use onset timestamp
-            word_copy['start'] = round(best_onset, 3)
+            starts[i] = onsets[best_idx]
             word_copy['_matched'] = True
-            used_onsets.add(best_onset)
             matched_count += 1
         else:
             # No direct match - use offset-adjusted timestamp
-            # Find surrounding onsets for potential micro-adjustment
-            prev_onset = None
-            next_onset = None
-
-            for onset in onsets:
-                if onset <= mm_start:
-                    prev_onset = onset
-                elif onset > mm_start and next_onset is None:
-                    next_onset = onset
-                    break
+            # Surrounding onsets for potential micro-adjustment:
+            # last <= mm_start, first > mm_start
+            j = int(bracket_idx[i])
+            prev_onset = onsets[j - 1] if j > 0 else None
+            next_onset = onsets[j] if j < n_onsets else None
 
             if prev_onset is not None and next_onset is not None:
                 # We're between two onsets - keep the offset-adjusted time
                 # but ensure we don't go before prev_onset
                 adjusted_start = max(mm_start, prev_onset + 0.05)
-                word_copy['start'] = round(adjusted_start, 3)
+                starts[i] = adjusted_start
             else:
                 # Use offset-adjusted timestamp directly
-                word_copy['start'] = round(max(0, mm_start), 3)
+                starts[i] = max(0, mm_start)
 
             word_copy['_interpolated'] = True
             interpolated_count += 1
 
         synced_words.append(word_copy)
 
+    # Round all starts to milliseconds at once
+    starts = np.round(starts, 3)
+
     # Recalculate end times: each word ends when next word starts
     # But preserve minimum duration based on word length
-    for i in range(len(synced_words) - 1):
-        current_start = synced_words[i]['start']
-        next_start = synced_words[i + 1]['start']
+    lengths = np.fromiter((len(w.get('word', '')) for w in synced_words),
+                          dtype=np.int64, count=len(synced_words))
 
-        # Minimum duration: ~80ms per character, min 150ms
-        word_text = synced_words[i].get('word', '')
-        min_duration = max(0.15, len(word_text) * 0.08)
+    # Minimum duration: ~80ms per character, min 150ms
+    min_durations = np.maximum(0.15, lengths * 0.08)
 
-        # End time is either next word's start or current + min_duration
-        if next_start > current_start:
-            synced_words[i]['end'] = round(next_start, 3)
-        else:
-            synced_words[i]['end'] = round(current_start + min_duration, 3)
+    # Last word has no successor: estimate ~100ms per character, min 300ms
+    next_starts = np.append(starts[1:], starts[-1] + max(0.3, lengths[-1] * 0.1))
 
-    # Last word: estimate duration
-    if synced_words:
-        last = synced_words[-1]
-        word_text = last.get('word', '')
-        min_duration = max(0.3, len(word_text) * 0.1)
-        last['end'] = round(last['start'] + min_duration, 3)
+    # End time is either next word's start or current + min_duration
+    ends = np.round(np.where(next_starts > starts, next_starts, starts + min_durations), 3)
+    for w, start, end in zip(synced_words, starts.tolist(), ends.tolist()):
+        w['start'] = start
+        w['end'] = end
 
     logger.info(f"[ONSET] Sync complete: {matched_count} matched, "
                 f"{interpolated_count} interpolated (tolerance={tolerance_ms}ms, "
@@ -296,7 +430,7 @@ def sync_lyrics_with_vocal_onsets(
     """
     # Step 1: Detect onsets
     onsets = detect_vocal_onsets(vocals_path)
-    if not onsets:
+    if onsets is None or onsets.size == 0:
         logger.warning("[ONSET] No onsets detected, returning original lyrics")
         return lyrics_segments, {"source": "musixmatch", "synced": False}
 
@@ -5,7 +5,7 @@ This is called directly by stems_extractor.py.
 """
 import os
 import sys
-import subprocess
+import runpy
 import argparse
 
 def main():
@@ -25,8 +25,20 @@ def main():
     print(f"wrap_demucs.py: PATH = {os.environ['PATH']}")
     print(f"wrap_demucs.py: Running demucs with args: {demucs_args}")
 
-    # Execute Demucs
-    return_code = subprocess.call([sys.executable, "-m", "demucs.separate"] + demucs_args)
+    # Execute Demucs in this interpreter (same as `python -m demucs.separate`):
+    # no second Python startup, and terminating this process stops Demucs too
+    sys.argv = ["demucs"] + demucs_args
+    try:
+        runpy.run_module("demucs.separate", run_name="__main__", alter_sys=True)
+        return_code = 0
+    except SystemExit as e:
+        if e.code is None:
+            return_code = 0
+        elif isinstance(e.code, int):
+            return_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            return_code = 1
 
     # Return the same exit code
     sys.exit(return_code)
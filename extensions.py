@@ -8,10 +8,12 @@ without circular dependencies.
 
 import os
 import re
-import uuid
+import secrets
 import time
 import logging
-from functools import wraps
+import threading
+from functools import wraps, lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import session, jsonify, redirect, url_for, flash
 from flask_socketio import SocketIO
@@ -23,7 +25,7 @@ from core.stems_extractor import StemsExtractor, ExtractionItem, ExtractionStatu
 from core.config import get_setting
 from core.downloads_db import (
     find_global_download as db_find_global_download,
-    add_user_access as db_add_user_access,
+    add_user_access_many as db_add_user_access_many,
     get_user_download_id_by_video_id as db_get_user_download_id,
     find_global_extraction as db_find_global_extraction,
     add_user_extraction_access as db_add_user_extraction_access,
@@ -50,6 +52,14 @@ COOKIES_FILE_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), 'core', 'youtube_cookies.txt'
 )
 
+_YT_ID_RE = re.compile(r'[A-Za-z0-9_-]{11}')
+
+_MOBILE_UA_RE = re.compile('|'.join(map(re.escape, (
+    "iphone", "android", "ipad", "ipod", "mobile",
+    "blackberry", "opera mini", "opera mobi", "windows phone",
+    "webos", "fennec", "kindle", "silk", "palm", "phone",
+))))
+
 # ── Utility functions ────────────────────────────────────────────────
 
 def get_model_display_name(model_key):
@@ -62,15 +72,10 @@ def get_model_display_name(model_key):
 
 def is_valid_youtube_video_id(video_id):
     """Validate a YouTube video ID."""
-    if not video_id or not isinstance(video_id, str):
-        return False
-    if len(video_id) != 11:
-        return False
-    if not re.match(r'^[a-zA-Z0-9_-]{11}$', video_id):
-        return False
-    return True
+    return isinstance(video_id, str) and _YT_ID_RE.fullmatch(video_id) is not None
 
 
+@lru_cache(maxsize=4096)
 def is_mobile_user_agent(user_agent: str) -> bool:
     """Simple heuristic to detect mobile browsers from the user-agent string."""
     if not user_agent:
@@ -78,13 +83,7 @@ def is_mobile_user_agent(user_agent: str) -> bool:
 
     ua = user_agent.lower()
 
-    mobile_indicators = (
-        "iphone", "android", "ipad", "ipod", "mobile",
-        "blackberry", "opera mini", "opera mobi", "windows phone",
-        "webos", "fennec", "kindle", "silk", "palm", "phone",
-    )
-
-    if any(indicator in ua for indicator in mobile_indicators):
+    if _MOBILE_UA_RE.search(ua):
         if "windows" in ua and "phone" not in ua:
             return False
         if "macintosh" in ua and "mobile" not in ua and "ipad" not in ua:
@@ -94,12 +93,52 @@ def is_mobile_user_agent(user_agent: str) -> bool:
     return False
 
 
+# Extraction progress is buffered per (room, extraction) and flushed at this
+# interval, so bursts of ticks collapse into one socket event
+PROGRESS_FLUSH_INTERVAL = 0.1
+
+# Lyrics (Whisper) and beat detection after an extraction run here one at a
+# time, so simultaneous completions don't load several GPU models at once
+_post_extraction_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="post-extraction")
+
+# (user_id, video_id) -> (download_id, cached_at); progress events fire many
+# times per second and the mapping doesn't change mid-extraction
+DOWNLOAD_ID_CACHE_TTL = 60
+DOWNLOAD_ID_CACHE_MAX = 4096
+_download_id_cache: dict[tuple, tuple] = {}
+_download_id_cache_lock = threading.Lock()
+
+
+def _cached_user_download_id(user_id, video_id):
+    """db_get_user_download_id with a short-lived in-memory cache of hits."""
+    key = (user_id, video_id)
+    now = time.monotonic()
+    with _download_id_cache_lock:
+        entry = _download_id_cache.get(key)
+        if entry and now - entry[1] < DOWNLOAD_ID_CACHE_TTL:
+            return entry[0]
+
+    download_id = db_get_user_download_id(user_id, video_id)
+    if download_id is not None:
+        with _download_id_cache_lock:
+            if len(_download_id_cache) >= DOWNLOAD_ID_CACHE_MAX:
+                _download_id_cache.clear()
+            _download_id_cache[key] = (download_id, now)
+    return download_id
+
+
+def _invalidate_user_download_id(user_id, video_id):
+    with _download_id_cache_lock:
+        _download_id_cache.pop((user_id, video_id), None)
+
+
 # ── Decorators ───────────────────────────────────────────────────────
 
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or not current_user.is_admin:
+        user = current_user._get_current_object()
+        if not user.is_authenticated or not user.is_admin:
             flash('You do not have permission to access this page.', 'error')
             return redirect(url_for('pages.index'))
         return f(*args, **kwargs)
@@ -110,7 +149,8 @@ def api_admin_required(f):
     """Admin required decorator for API endpoints - returns JSON error instead of redirect."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or not current_user.is_admin:
+        user = current_user._get_current_object()
+        if not user.is_authenticated or not user.is_admin:
             return jsonify({
                 'error': 'Forbidden',
                 'message': 'Admin access required'
@@ -149,20 +189,37 @@ def youtube_access_required(f):
 class UserSessionManager:
     """Stable per-user (or per-anonymous) managers keyed by a deterministic id."""
 
+    __slots__ = (
+        'download_managers', 'stems_extractors', 'pending_reload_users',
+        '_download_index', '_video_to_dms', '_video_to_ses',
+        '_progress_buffer', '_progress_last_sent', '_progress_lock', '_progress_flusher_started',
+    )
+
     def __init__(self):
         self.download_managers: dict[str, DownloadManager] = {}
         self.stems_extractors: dict[str, StemsExtractor] = {}
         self.pending_reload_users: dict[str, set[int]] = {}
+        # download_id -> owning manager, for in-flight downloads
+        self._download_index: dict[str, DownloadManager] = {}
+        # video_id -> managers/extractors that have been handed an item for it
+        self._video_to_dms: dict[str, set[DownloadManager]] = {}
+        self._video_to_ses: dict[str, set[StemsExtractor]] = {}
+        # Latest pending extraction_progress payload and last sent (progress, status) per (room, extraction_id)
+        self._progress_buffer: dict[tuple[str, str], dict] = {}
+        self._progress_last_sent: dict[tuple[str, str], tuple] = {}
+        self._progress_lock = threading.Lock()
+        self._progress_flusher_started = False
 
     # ---------- internal helper ----------
     def _key(self) -> str:
         """Return stable key: 'user_<id>' or consistent anonymous key."""
         from flask import has_request_context
         if has_request_context():
-            if current_user.is_authenticated:
-                return f"user_{current_user.id}"
+            user = current_user._get_current_object()
+            if user.is_authenticated:
+                return f"user_{user.id}"
             if 'anon_key' not in session:
-                session['anon_key'] = str(uuid.uuid4())
+                session['anon_key'] = secrets.token_urlsafe(16)
             return session['anon_key']
         return "background_fallback"
 
@@ -172,24 +229,16 @@ class UserSessionManager:
         if key not in self.download_managers:
             dm = DownloadManager()
             room_key = key
-            user_id = current_user.id if current_user and current_user.is_authenticated else None
-            dm.on_download_progress = (
-                lambda item_id, progress, speed=None, eta=None, rk=room_key:
-                    self._emit_progress_with_room(item_id, progress, speed, eta, rk)
-            )
-            dm.on_download_complete = (
-                lambda item_id, title=None, file_path=None, download_item=None,
-                       rk=room_key, uid=user_id, dm_ref=dm, manager_key=key:
-                    self._emit_complete_with_room(
-                        item_id, title, file_path, rk, uid,
-                        dm_instance=dm_ref, dm_key=manager_key,
-                        download_item=download_item
-                    )
-            )
-            dm.on_download_error = (
-                lambda item_id, error, rk=room_key:
-                    self._emit_error_with_room(item_id, error, rk)
+            user = current_user._get_current_object()
+            user_id = user.id if user is not None and user.is_authenticated else None
+            dm.on_download_progress = partial(self._emit_progress_with_room, room_key=room_key)
+            dm.on_download_complete = partial(
+                self._emit_complete_with_room,
+                room_key=room_key, user_id=user_id, dm_instance=dm, dm_key=key
             )
+            dm.on_download_error = partial(self._emit_error_with_room, room_key=room_key)
+            dm.on_item_added = partial(self._on_download_added, dm=dm)
+            dm.on_item_removed = partial(self._on_download_removed, dm=dm)
             self.download_managers[key] = dm
         return self.download_managers[key]
 
@@ -208,22 +257,55 @@ class UserSessionManager:
 
     def clear_download_from_all_sessions(self, video_id: str):
         """Remove a download from all active user download managers."""
-        print(f"[CLEANUP] Clearing video_id={video_id} from {len(self.download_managers)} active sessions")
-        for key, dm in self.download_managers.items():
-            removed = dm.remove_download_by_video_id(video_id)
-            if removed:
-                print(f"[CLEANUP] Removed from session: {key}")
+        managers = self._video_to_dms.pop(video_id, ())
+        logger.debug("[CLEANUP] Clearing video_id=%s from %d session(s)", video_id, len(managers))
+        for dm in managers:
+            if dm.remove_download_by_video_id(video_id):
+                logger.debug("[CLEANUP] Removed video_id=%s from a session download manager", video_id)
 
     def clear_extraction_from_all_sessions(self, video_id: str):
         """Remove an extraction from all active user session extractors."""
-        print(f"[CLEANUP] Clearing extraction for video_id={video_id} from {len(self.stems_extractors)} active sessions")
-        for key, se in self.stems_extractors.items():
-            for collection_name in ['queued_extractions', 'active_extractions', 'failed_extractions', 'completed_extractions']:
-                collection = getattr(se, collection_name, {})
-                keys_to_remove = [k for k, v in collection.items() if hasattr(v, 'video_id') and v.video_id == video_id]
-                for item_key in keys_to_remove:
-                    del collection[item_key]
-                    print(f"[CLEANUP] Removed {item_key} from {collection_name} in session {key}")
+        extractors = self._video_to_ses.pop(video_id, ())
+        logger.debug("[CLEANUP] Clearing extraction for video_id=%s from %d session(s)", video_id, len(extractors))
+        for se in extractors:
+            if se.remove_extraction_by_video_id(video_id):
+                logger.debug("[CLEANUP] Removed video_id=%s from a session stems extractor", video_id)
+
+    # ---------- video_id -> manager index (kept by the managers' item hooks) ----------
+    @staticmethod
+    def _unindex_video(index, manager, video_id, collections):
+        """Drop manager from index[video_id] unless it still holds an item for that video."""
+        managers = index.get(video_id)
+        if not managers or manager not in managers:
+            return
+        for name in collections:
+            if any(v.video_id == video_id for v in getattr(manager, name).values()):
+                return
+        managers.discard(manager)
+        if not managers:
+            index.pop(video_id, None)
+
+    def _on_download_added(self, item, *, dm):
+        self._download_index[item.download_id] = dm
+        self._video_to_dms.setdefault(item.video_id, set()).add(dm)
+
+    def _on_download_removed(self, item, *, dm):
+        self._download_index.pop(item.download_id, None)
+        self._unindex_video(self._video_to_dms, dm, item.video_id,
+                            ('queued_downloads', 'active_downloads', 'failed_downloads', 'completed_downloads'))
+
+    def _on_extraction_added(self, item, *, se):
+        self._video_to_ses.setdefault(item.video_id, set()).add(se)
+
+    def _on_extraction_removed(self, item, *, se, room_key):
+        self._discard_extraction_progress(item.extraction_id, room_key)
+        self._unindex_video(self._video_to_ses, se, item.video_id,
+                            ('queued_extractions', 'active_extractions', 'failed_extractions', 'completed_extractions'))
+
+    def _on_extraction_cancelled(self, item, *, room_key):
+        # The extractor stops reporting once the item leaves active_extractions;
+        # drop whatever tick is still buffered so it can't follow the cancel
+        self._discard_extraction_progress(item.extraction_id, room_key)
 
     # ---------- stems extractor ----------
     def get_stems_extractor(self) -> StemsExtractor:
@@ -231,39 +313,48 @@ class UserSessionManager:
         if key not in self.stems_extractors:
             se = StemsExtractor()
             room_key = key
-            user_id = current_user.id if current_user and current_user.is_authenticated else None
-            se.on_extraction_progress = (
-                lambda item_id, progress, status_msg=None, video_id=None, title=None:
-                    self._emit_extraction_progress_with_room(item_id, progress, status_msg, room_key, user_id, video_id, title)
+            user = current_user._get_current_object()
+            user_id = user.id if user is not None and user.is_authenticated else None
+            se.on_extraction_progress = partial(
+                self._emit_extraction_progress_with_room, room_key=room_key, user_id=user_id
             )
-            se.on_extraction_complete = (
-                lambda item_id, title=None, video_id=None, item=None:
-                    self._emit_extraction_complete_with_room(item_id, title, video_id, room_key, user_id, item)
+            se.on_extraction_complete = partial(
+                self._emit_extraction_complete_with_room, room_key=room_key, user_id=user_id
             )
-            se.on_extraction_error = (
-                lambda item_id, error, video_id=None:
-                    self._emit_extraction_error_with_room(item_id, error, room_key, video_id, user_id)
+            se.on_extraction_error = partial(
+                self._emit_extraction_error_with_room, room_key=room_key, user_id=user_id
             )
+            se.on_item_added = partial(self._on_extraction_added, se=se)
+            se.on_item_removed = partial(self._on_extraction_removed, se=se, room_key=room_key)
+            se.on_item_cancelled = partial(self._on_extraction_cancelled, room_key=room_key)
             self.stems_extractors[key] = se
         return self.stems_extractors[key]
 
     # ---------- safe emitters with room keys ----------
-    def _emit_progress_with_room(self, item_id, progress, speed_or_msg=None, eta=None, room_key=None):
+    def _emit_progress_with_room(self, item_id, progress, speed_or_msg=None, eta=None, *, room_key):
         socketio.emit('download_progress', {
             'download_id': item_id,
             'progress': progress,
             'speed': speed_or_msg,
             'eta': eta
-        }, room=room_key or self._key())
+        }, room=room_key)
+
+    def _emit_extraction_progress_with_room(self, item_id, progress, status_msg=None, video_id=None, title=None, *, room_key, user_id=None):
+        buffer_key = (room_key, item_id)
+        status_message = status_msg or "Extracting stems..."
+
+        # Drop ticks that would not visibly change the progress bar
+        last = self._progress_last_sent.get(buffer_key)
+        if last and abs(progress - last[0]) < 1.0 and progress < 100 and status_message == last[1]:
+            return
 
-    def _emit_extraction_progress_with_room(self, item_id, progress, status_msg=None, room_key=None, user_id=None, video_id=None, title=None):
         logger.info(f"[EXTRACTION PROGRESS] Emitting progress for extraction_id={item_id}, progress={progress:.1f}%")
         logger.debug(f"[EXTRACTION PROGRESS] Received data: video_id={video_id}, title={title}, user_id={user_id}")
 
         download_id = None
         if user_id and video_id is not None and video_id != "":
             try:
-                download_id = db_get_user_download_id(user_id, video_id)
+                download_id = _cached_user_download_id(user_id, video_id)
                 logger.debug(f"[EXTRACTION PROGRESS] Found download_id {download_id} for user {user_id}, video {video_id}")
             except Exception as e:
                 logger.warning(f"[EXTRACTION PROGRESS] Could not get download_id for user {user_id}, video {video_id}: {e}")
@@ -275,47 +366,49 @@ class UserSessionManager:
             'video_id': video_id,
             'download_id': download_id,
             'progress': progress,
-            'status_message': status_msg or "Extracting stems..."
+            'status_message': status_message
         }
 
-        logger.info(f"[EXTRACTION PROGRESS] Emitting WebSocket event: {emission_data}")
-        socketio.emit('extraction_progress', emission_data, room=room_key or self._key())
+        logger.info(f"[EXTRACTION PROGRESS] Buffering WebSocket event: {emission_data}")
+        with self._progress_lock:
+            self._progress_last_sent[buffer_key] = (progress, status_message)
+            self._progress_buffer[buffer_key] = emission_data
+            start_flusher = not self._progress_flusher_started
+            self._progress_flusher_started = True
+        if start_flusher:
+            socketio.start_background_task(self._progress_flush_loop)
+
+    def _progress_flush_loop(self):
+        """Emit the latest buffered extraction_progress event per (room, extraction)."""
+        while True:
+            socketio.sleep(PROGRESS_FLUSH_INTERVAL)
+            with self._progress_lock:
+                if not self._progress_buffer:
+                    continue
+                pending, self._progress_buffer = self._progress_buffer, {}
+            for (room, _), emission_data in pending.items():
+                try:
+                    socketio.emit('extraction_progress', emission_data, room=room)
+                except Exception as e:
+                    logger.warning(f"[EXTRACTION PROGRESS] Failed to emit progress: {e}")
+
+    def _discard_extraction_progress(self, item_id, room):
+        """Forget buffered progress so it cannot arrive after a final event."""
+        with self._progress_lock:
+            self._progress_buffer.pop((room, item_id), None)
+            self._progress_last_sent.pop((room, item_id), None)
 
-    def _emit_complete_with_room(self, item_id, title=None, file_path=None, room_key=None, user_id=None, dm_instance=None, dm_key=None, download_item=None):
+    def _emit_complete_with_room(self, item_id, title=None, file_path=None, download_item=None, *, room_key, user_id=None, dm_instance=None, dm_key=None):
+        indexed_manager = self._download_index.pop(item_id, None)
         if title:
             video_id = getattr(download_item, "video_id", None)
 
             if not download_item or not video_id:
-                candidate_managers = []
-                seen_ids = set()
-
-                def _add_candidate(manager):
-                    if manager and id(manager) not in seen_ids:
-                        candidate_managers.append(manager)
-                        seen_ids.add(id(manager))
-
-                _add_candidate(dm_instance)
-                if dm_key:
-                    _add_candidate(self.download_managers.get(dm_key))
-                if user_id:
-                    _add_candidate(self.download_managers.get(f"user_{user_id}"))
-                if not candidate_managers:
-                    for manager in self.download_managers.values():
-                        _add_candidate(manager)
-
-                for manager in candidate_managers:
-                    if not manager:
-                        continue
-                    for status in ['active', 'completed', 'failed']:
-                        for item in manager.get_all_downloads().get(status, []):
-                            if item.download_id == item_id:
-                                download_item = item
-                                video_id = item.video_id
-                                break
-                        if download_item:
-                            break
-                    if download_item:
-                        break
+                manager = indexed_manager or dm_instance or (self.download_managers.get(dm_key) if dm_key else None)
+                found = manager.get_download_status(item_id) if manager else None
+                if found:
+                    download_item = found
+                    video_id = found.video_id
 
             if not video_id:
                 logger.warning(f"Could not find video_id for download {item_id}, using fallback extraction")
@@ -330,13 +423,12 @@ class UserSessionManager:
 
             global_download_id = None
             if user_id and download_item:
-                file_size = 0
-                if file_path and os.path.exists(file_path):
-                    try:
-                        file_size = os.path.getsize(file_path)
-                    except:
-                        file_size = 0
+                try:
+                    file_size = os.stat(file_path).st_size if file_path else 0
+                except OSError:
+                    file_size = 0
 
+                _invalidate_user_download_id(user_id, download_item.video_id)
                 global_download_id = db_add_download(user_id, {
                     "video_id": download_item.video_id,
                     "title": download_item.title,
@@ -352,26 +444,19 @@ class UserSessionManager:
                     try:
                         global_download = db_find_global_download(download_item.video_id, download_item.download_type.value, download_item.quality)
                         if global_download:
-                            restored = 0
-                            for reload_user_id in pending_reload_users:
-                                if not reload_user_id or reload_user_id == user_id:
-                                    continue
-                                try:
-                                    db_add_user_access(reload_user_id, global_download)
-                                    restored += 1
-                                except Exception as e:
-                                    logger.warning(f"Failed to restore access for user {reload_user_id} on video {download_item.video_id}: {e}")
+                            reload_user_ids = [uid for uid in pending_reload_users if uid and uid != user_id]
+                            restored = db_add_user_access_many(reload_user_ids, global_download)
+                            for reload_user_id in reload_user_ids:
+                                _invalidate_user_download_id(reload_user_id, download_item.video_id)
                             if restored:
                                 logger.info(f"Restored access for {restored} user(s) after reload of video {download_item.video_id}")
                     except Exception as e:
                         logger.error(f"Failed to restore reload access for video {download_item.video_id}: {e}", exc_info=True)
             elif user_id:
-                file_size = 0
-                if file_path and os.path.exists(file_path):
-                    try:
-                        file_size = os.path.getsize(file_path)
-                    except:
-                        file_size = 0
+                try:
+                    file_size = os.stat(file_path).st_size if file_path else 0
+                except OSError:
+                    file_size = 0
 
                 if '_' in item_id:
                     parts = item_id.split('_')
@@ -382,6 +467,7 @@ class UserSessionManager:
                 with log_with_context(logger, video_id=fallback_video_id):
                     logger.debug(f"Fallback db save: item_id={item_id}")
 
+                _invalidate_user_download_id(user_id, fallback_video_id)
                 global_download_id = db_add_download(user_id, {
                     "video_id": fallback_video_id,
                     "title": title,
@@ -398,14 +484,16 @@ class UserSessionManager:
                 'file_path': file_path,
                 'video_id': video_id,
                 'global_download_id': global_download_id
-            }, room=room_key or self._key())
+            }, room=room_key)
 
-    def _emit_error_with_room(self, item_id, error, room_key=None):
-        socketio.emit('download_error', {'download_id': item_id, 'error_message': error}, room=room_key or self._key())
+    def _emit_error_with_room(self, item_id, error, *, room_key):
+        self._download_index.pop(item_id, None)
+        socketio.emit('download_error', {'download_id': item_id, 'error_message': error}, room=room_key)
 
-    def _emit_extraction_error_with_room(self, item_id, error, room_key=None, video_id=None, user_id=None):
+    def _emit_extraction_error_with_room(self, item_id, error, video_id=None, *, room_key, user_id=None):
         logger.error(f"Extraction error: item_id={item_id}, error={error}, video_id={video_id}, user_id={user_id}")
-        socketio.emit('extraction_error', {'extraction_id': item_id, 'error_message': error}, room=room_key or self._key())
+        self._discard_extraction_progress(item_id, room_key)
+        socketio.emit('extraction_error', {'extraction_id': item_id, 'error_message': error}, room=room_key)
 
         if video_id:
             with log_with_context(logger, video_id=video_id, user_id=user_id):
@@ -416,224 +504,208 @@ class UserSessionManager:
             except Exception as db_error:
                 logger.error(f"Error clearing extracting flag: {db_error}")
 
-    def _emit_extraction_complete_with_room(self, item_id, title=None, video_id=None, room_key=None, user_id=None, item=None):
+    def _emit_extraction_complete_with_room(self, item_id, title=None, video_id=None, item=None, *, room_key, user_id=None):
         """Handle extraction completion - always emits extraction_complete event."""
+        self._discard_extraction_progress(item_id, room_key)
+        # LogContext swaps the global record factory, so one entry covers both loggers
         with log_with_context(processing_logger, user_id=user_id, video_id=video_id):
             processing_logger.info(f"Extraction finished: {title}")
-
-        logger.debug(f"Extraction complete for {item_id}: video_id='{video_id}', user_id={user_id}")
+            logger.debug(f"Extraction complete for {item_id}: video_id='{video_id}', user_id={user_id}")
+            if user_id and video_id and item:
+                processing_logger.debug(f"Extraction details: status={item.status.value}, model={item.model_name}")
 
         if user_id and video_id and item:
-            with log_with_context(logger, user_id=user_id, video_id=video_id):
-                logger.debug("Processing extraction completion context")
-            with log_with_context(processing_logger, video_id=item.video_id):
-                processing_logger.debug(f"Extraction details: status={item.status.value}, model={item.model_name}")
-            print(f"[CALLBACK DEBUG] Stems paths: {item.output_paths}")
-            print(f"[CALLBACK DEBUG] Zip path: {item.zip_path}")
+            logger.debug("Stems paths: %s", item.output_paths)
+            logger.debug("Zip path: %s", item.zip_path)
 
             if item and item.video_id:
-                print(f"[CALLBACK DEBUG] Persisting extraction to database...")
+                logger.debug("Persisting extraction to database")
                 try:
                     db_mark_extraction_complete(item.video_id, {
                         "model_name": item.model_name,
                         "stems_paths": item.output_paths or {},
                         "zip_path": item.zip_path or ""
                     })
-                    print(f"[CALLBACK DEBUG] Global download marked as extracted")
+                    logger.debug("Global download marked as extracted")
 
                     global_download = db_find_global_extraction(item.video_id, item.model_name)
                     if global_download:
                         db_add_user_extraction_access(user_id, global_download)
-                        print(f"[CALLBACK DEBUG] User access granted to extraction")
+                        logger.debug("User access granted to extraction")
 
-                        user_extractions = db_list_extractions(user_id)
-                        print(f"[CALLBACK DEBUG] User now has {len(user_extractions)} extractions in database")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("User now has %d extractions in database", len(db_list_extractions(user_id)))
                     else:
-                        print(f"[CALLBACK DEBUG] ERROR: Could not find global extraction after marking complete")
+                        logger.error("Could not find global extraction after marking complete")
                 except Exception as e:
-                    print(f"[CALLBACK DEBUG] ERROR: Failed to persist extraction to database: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.error("Failed to persist extraction to database: %s", e, exc_info=True)
+
+                # Lyrics and beat detection run on the single post-extraction
+                # worker; extraction_complete is emitted once they finish
+                _post_extraction_executor.submit(
+                    self._post_extraction_pipeline,
+                    item_id, title, video_id, room_key, user_id, item
+                )
+                return
+        else:
+            logger.debug("Missing user_id, video_id, or item data")
 
-                # AUTO-DETECT LYRICS after stems are ready (Whisper only — Musixmatch reserved for Regenerate)
-                _room = room_key or self._key()
-                try:
-                    vocals_path = item.output_paths.get('vocals') if item.output_paths else None
-                    if vocals_path and os.path.exists(vocals_path):
-                        logger.info(f"[LYRICS] Auto-detecting lyrics using vocals stem: {vocals_path}")
+        self._finish_extraction(item_id, title, video_id, room_key, user_id, item)
 
-                        # Emit unified extraction progress at 48% for lyrics phase
+    def _post_extraction_pipeline(self, item_id, title, video_id, room, user_id, item):
+        """Run auto lyrics and beat detection for a finished extraction, then emit completion."""
+        try:
+            # AUTO-DETECT LYRICS after stems are ready (Whisper only — Musixmatch reserved for Regenerate)
+            try:
+                vocals_path = item.output_paths.get('vocals') if item.output_paths else None
+                if vocals_path and os.path.exists(vocals_path):
+                    logger.info(f"[LYRICS] Auto-detecting lyrics using vocals stem: {vocals_path}")
+
+                    # Emit unified extraction progress at 48% for lyrics phase
+                    socketio.emit('extraction_progress', {
+                        'extraction_id': item_id,
+                        'progress': 48,
+                        'message': 'Transcribing lyrics...',
+                        'video_id': video_id
+                    }, room=room)
+                    socketio.emit('lyrics_progress', {
+                        'extraction_id': item_id,
+                        'step': 'auto_start',
+                        'message': 'Transcribing lyrics...',
+                        'video_id': video_id
+                    }, room=room)
+
+                    from core.lyrics_detector import detect_lyrics_unified
+                    from core.downloads_db import update_download_lyrics
+
+                    model_size = get_setting('lyrics_model_size') or 'medium'
+                    use_gpu = get_setting('use_gpu_for_extraction', False)
+
+                    # Map lyrics steps to extraction progress (48-72% range)
+                    _lyrics_step_progress = {
+                        'metadata': 50, 'whisper': 55, 'whisper_done': 68,
+                        'done': 72, 'failed': 72,
+                    }
+
+                    def _lyrics_progress_cb(step, msg):
+                        # Emit lyrics_progress for karaoke-display.js compatibility
+                        socketio.emit('lyrics_progress', {
+                            'extraction_id': item_id, 'step': step,
+                            'message': msg, 'video_id': video_id
+                        }, room=room)
+                        # Emit extraction_progress mapped to 48-72% range
+                        progress_val = _lyrics_step_progress.get(step, 55)
                         socketio.emit('extraction_progress', {
-                            'extraction_id': item_id,
-                            'progress': 48,
-                            'message': 'Transcribing lyrics...',
-                            'video_id': video_id
-                        }, room=_room)
+                            'extraction_id': item_id, 'progress': progress_val,
+                            'message': msg, 'video_id': video_id
+                        }, room=room)
+
+                    result = detect_lyrics_unified(
+                        audio_path=vocals_path,
+                        title=title,
+                        model_size=model_size,
+                        use_gpu=use_gpu,
+                        force_whisper=True,
+                        progress_callback=_lyrics_progress_cb
+                    )
+
+                    if result.get('lyrics'):
+                        update_download_lyrics(video_id, result['lyrics'])
+                        logger.info(f"[LYRICS] Auto-detected: {len(result['lyrics'])} segments ({result.get('source')})")
                         socketio.emit('lyrics_progress', {
                             'extraction_id': item_id,
-                            'step': 'auto_start',
-                            'message': 'Transcribing lyrics...',
-                            'video_id': video_id
-                        }, room=_room)
-
-                        from core.lyrics_detector import detect_lyrics_unified
-                        from core.downloads_db import update_download_lyrics
-
-                        model_size = get_setting('lyrics_model_size') or 'medium'
-                        use_gpu = get_setting('use_gpu_for_extraction', False)
-
-                        # Map lyrics steps to extraction progress (48-72% range)
-                        _lyrics_step_progress = {
-                            'metadata': 50, 'whisper': 55, 'whisper_done': 68,
-                            'done': 72, 'failed': 72,
-                        }
-
-                        def _lyrics_progress_cb(step, msg):
-                            # Emit lyrics_progress for karaoke-display.js compatibility
-                            socketio.emit('lyrics_progress', {
-                                'extraction_id': item_id, 'step': step,
-                                'message': msg, 'video_id': video_id
-                            }, room=_room)
-                            # Emit extraction_progress mapped to 48-72% range
-                            progress_val = _lyrics_step_progress.get(step, 55)
-                            socketio.emit('extraction_progress', {
-                                'extraction_id': item_id, 'progress': progress_val,
-                                'message': msg, 'video_id': video_id
-                            }, room=_room)
-
-                        result = detect_lyrics_unified(
-                            audio_path=vocals_path,
-                            title=title,
-                            model_size=model_size,
-                            use_gpu=use_gpu,
-                            force_whisper=True,
-                            progress_callback=_lyrics_progress_cb
-                        )
-
-                        if result.get('lyrics'):
-                            update_download_lyrics(video_id, result['lyrics'])
-                            logger.info(f"[LYRICS] Auto-detected: {len(result['lyrics'])} segments ({result.get('source')})")
-                            socketio.emit('lyrics_progress', {
-                                'extraction_id': item_id,
-                                'step': 'auto_complete',
-                                'message': f"Lyrics ready: {len(result['lyrics'])} segments",
-                                'video_id': video_id,
-                                'source': result.get('source')
-                            }, room=_room)
-                        else:
-                            logger.warning("[LYRICS] Auto-detection failed - no lyrics found")
-
-                        # Ensure progress reaches 72% after lyrics phase
-                        socketio.emit('extraction_progress', {
-                            'extraction_id': item_id, 'progress': 72,
-                            'message': 'Lyrics detection complete', 'video_id': video_id
-                        }, room=_room)
+                            'step': 'auto_complete',
+                            'message': f"Lyrics ready: {len(result['lyrics'])} segments",
+                            'video_id': video_id,
+                            'source': result.get('source')
+                        }, room=room)
                     else:
-                        logger.debug("[LYRICS] No vocals stem available for auto-detection")
-                        # Skip lyrics — jump progress to 72%
-                        socketio.emit('extraction_progress', {
-                            'extraction_id': item_id, 'progress': 72,
-                            'message': 'No vocals for lyrics, skipping...', 'video_id': video_id
-                        }, room=_room)
-                except Exception as lyrics_error:
-                    logger.warning(f"[LYRICS] Auto-detection error (non-fatal): {lyrics_error}")
+                        logger.warning("[LYRICS] Auto-detection failed - no lyrics found")
+
+                    # Ensure progress reaches 72% after lyrics phase
                     socketio.emit('extraction_progress', {
                         'extraction_id': item_id, 'progress': 72,
-                        'message': 'Lyrics detection skipped', 'video_id': video_id
-                    }, room=_room)
+                        'message': 'Lyrics detection complete', 'video_id': video_id
+                    }, room=room)
+                else:
+                    logger.debug("[LYRICS] No vocals stem available for auto-detection")
+                    # Skip lyrics — jump progress to 72%
+                    socketio.emit('extraction_progress', {
+                        'extraction_id': item_id, 'progress': 72,
+                        'message': 'No vocals for lyrics, skipping...', 'video_id': video_id
+                    }, room=room)
+            except Exception as lyrics_error:
+                logger.warning(f"[LYRICS] Auto-detection error (non-fatal): {lyrics_error}")
+                socketio.emit('extraction_progress', {
+                    'extraction_id': item_id, 'progress': 72,
+                    'message': 'Lyrics detection skipped', 'video_id': video_id
+                }, room=room)
+
+            # AUTO-DETECT BEATS after stems are ready (madmom downbeat detection)
+            try:
+                audio_path = item.audio_path if hasattr(item, 'audio_path') else None
+                if audio_path and os.path.exists(audio_path):
+                    logger.info(f"[BEATS] Running madmom downbeat detection on {audio_path}")
+                    socketio.emit('extraction_progress', {
+                        'extraction_id': item_id,
+                        'progress': 72,
+                        'message': 'Detecting beats...',
+                        'video_id': video_id
+                    }, room=room)
 
-                # AUTO-DETECT BEATS after stems are ready (madmom downbeat detection)
-                try:
-                    audio_path = item.audio_path if hasattr(item, 'audio_path') else None
-                    if audio_path and os.path.exists(audio_path):
-                        logger.info(f"[BEATS] Running madmom downbeat detection on {audio_path}")
-                        socketio.emit('extraction_progress', {
-                            'extraction_id': item_id,
-                            'progress': 72,
-                            'message': 'Detecting beats...',
-                            'video_id': video_id
-                        }, room=_room)
-
-                        from core.madmom_chord_detector import MadmomChordDetector
-                        from core.downloads_db import update_download_analysis
-
-                        detector = MadmomChordDetector()
-
-                        # Get existing BPM as hint from global_downloads
-                        known_bpm = None
-                        try:
-                            from core.db.connection import _conn
-                            with _conn() as conn:
-                                row = conn.execute(
-                                    "SELECT detected_bpm, detected_key, analysis_confidence, chords_data, structure_data, lyrics_data FROM global_downloads WHERE video_id=?",
-                                    (video_id,)
-                                ).fetchone()
-                                if row:
-                                    known_bpm = row['detected_bpm']
-                                    existing_key = row['detected_key']
-                                    existing_confidence = row['analysis_confidence']
-                                    existing_chords = row['chords_data']
-                                    existing_structure = row['structure_data']
-                                    existing_lyrics = row['lyrics_data']
-                                else:
-                                    existing_key = None
-                                    existing_confidence = None
-                                    existing_chords = None
-                                    existing_structure = None
-                                    existing_lyrics = None
-                        except Exception:
-                            existing_key = None
-                            existing_confidence = None
-                            existing_chords = None
-                            existing_structure = None
-                            existing_lyrics = None
-
-                        beat_offset, beats, beat_positions = detector._detect_beats(audio_path, known_bpm=known_bpm)
-                        beat_times_list = [round(float(t), 4) for t in beats] if len(beats) > 0 else []
-
-                        if beat_times_list:
-                            # Preserve existing chords/structure/lyrics — parse JSON back since update_download_analysis re-serializes
-                            import json as _json
-                            _existing_structure = _json.loads(existing_structure) if existing_structure else None
-                            _existing_lyrics = _json.loads(existing_lyrics) if existing_lyrics else None
-                            update_download_analysis(
-                                video_id,
-                                detected_bpm=known_bpm,
-                                detected_key=existing_key,
-                                analysis_confidence=existing_confidence,
-                                chords_data=existing_chords,
-                                structure_data=_existing_structure,
-                                lyrics_data=_existing_lyrics,
-                                beat_offset=beat_offset,
-                                beat_times=beat_times_list,
-                                beat_positions=beat_positions
-                            )
-                            logger.info(f"[BEATS] Detected {len(beat_times_list)} beats, "
-                                        f"{sum(1 for p in beat_positions if p == 1)} downbeats")
-                        else:
-                            logger.warning("[BEATS] No beats detected")
+                    from core.madmom_chord_detector import MadmomChordDetector
+                    from core.downloads_db import update_download_beats_only
 
-                        socketio.emit('extraction_progress', {
-                            'extraction_id': item_id,
-                            'progress': 97,
-                            'message': 'Beat detection complete',
-                            'video_id': video_id
-                        }, room=_room)
+                    detector = MadmomChordDetector()
+
+                    # Get existing BPM as hint from global_downloads
+                    known_bpm = None
+                    try:
+                        from core.db.connection import _conn
+                        with _conn() as conn:
+                            row = conn.execute(
+                                "SELECT detected_bpm FROM global_downloads WHERE video_id=?",
+                                (video_id,)
+                            ).fetchone()
+                            if row:
+                                known_bpm = row['detected_bpm']
+                    except Exception:
+                        pass
+
+                    beat_offset, beats, beat_positions = detector._detect_beats(audio_path, known_bpm=known_bpm)
+                    beat_times_list = [round(float(t), 4) for t in beats] if len(beats) > 0 else []
+
+                    if beat_times_list:
+                        # Only the beat columns change; chords/structure/lyrics are left untouched
+                        update_download_beats_only(video_id, beat_offset, beat_times_list, beat_positions)
+                        logger.info(f"[BEATS] Detected {len(beat_times_list)} beats, "
+                                    f"{sum(1 for p in beat_positions if p == 1)} downbeats")
                     else:
-                        logger.debug("[BEATS] No audio file available for beat detection")
-                        socketio.emit('extraction_progress', {
-                            'extraction_id': item_id, 'progress': 97,
-                            'message': 'No audio for beats, skipping...', 'video_id': video_id
-                        }, room=_room)
-                except Exception as beat_error:
-                    logger.warning(f"[BEATS] Beat detection error (non-fatal): {beat_error}")
+                        logger.warning("[BEATS] No beats detected")
+
+                    socketio.emit('extraction_progress', {
+                        'extraction_id': item_id,
+                        'progress': 97,
+                        'message': 'Beat detection complete',
+                        'video_id': video_id
+                    }, room=room)
+                else:
+                    logger.debug("[BEATS] No audio file available for beat detection")
                     socketio.emit('extraction_progress', {
                         'extraction_id': item_id, 'progress': 97,
-                        'message': 'Beat detection skipped', 'video_id': video_id
-                    }, room=_room)
-        else:
-            print(f"[CALLBACK DEBUG] Missing user_id, video_id, or item data")
-
+                        'message': 'No audio for beats, skipping...', 'video_id': video_id
+                    }, room=room)
+            except Exception as beat_error:
+                logger.warning(f"[BEATS] Beat detection error (non-fatal): {beat_error}")
+                socketio.emit('extraction_progress', {
+                    'extraction_id': item_id, 'progress': 97,
+                    'message': 'Beat detection skipped', 'video_id': video_id
+                }, room=room)
+        finally:
+            self._finish_extraction(item_id, title, video_id, room, user_id, item)
+
+    def _finish_extraction(self, item_id, title, video_id, room, user_id, item):
+        """Mark an extraction COMPLETED and emit the final progress and completion events."""
         # Mark extraction as COMPLETED now that all post-processing is done
         if item:
             item.status = ExtractionStatus.COMPLETED
@@ -645,7 +717,7 @@ class UserSessionManager:
             'progress': 100,
             'message': 'Extraction completed',
             'video_id': video_id
-        }, room=room_key or self._key())
+        }, room=room)
 
         # Emit socket events (after database is updated)
         download_id = None
@@ -661,44 +733,36 @@ class UserSessionManager:
             'video_id': video_id,
             'download_id': download_id,
             'title': title
-        }, room=room_key or self._key())
+        }, room=room)
 
         logger.debug("Broadcasting extraction completion to ALL connected clients")
+        payload = {'extraction_id': item_id, 'video_id': video_id, 'title': title}
         try:
-            socketio.emit('extraction_completed_global', {
-                'extraction_id': item_id,
-                'video_id': video_id,
-                'title': title
-            }, namespace='/')
-            logger.debug("Global broadcast sent to all clients")
-        except Exception as e:
-            logger.error(f"Error sending global broadcast: {e}")
-
-        try:
-            socketio.emit('extraction_refresh_needed', {
-                'extraction_id': item_id,
-                'video_id': video_id,
-                'title': title,
-                'message': 'New extraction available - please refresh'
-            })
-            logger.debug("Alternative global event sent")
-        except Exception as e:
-            logger.error(f"Error sending alternative event: {e}")
+            # One frame per client; clients dispatch on 'kind'
+            socketio.emit('extraction_event', {'kind': 'completed', **payload}, namespace='/')
+            if get_setting('legacy_extraction_events', False):
+                socketio.emit('extraction_completed_global', payload, namespace='/')
+                socketio.emit('extraction_refresh_needed', {
+                    **payload,
+                    'message': 'New extraction available - please refresh'
+                })
+        except Exception:
+            logger.exception("Error sending global extraction broadcast")
 
     # ---------- legacy emitters (kept for compatibility) ----------
     def _emit_progress(self, item_id, progress, speed_or_msg=None, eta=None):
-        self._emit_progress_with_room(item_id, progress, speed_or_msg, eta, self._key())
+        self._emit_progress_with_room(item_id, progress, speed_or_msg, eta, room_key=self._key())
 
     def _emit_complete(self, item_id, title=None, file_path=None):
         user_id = current_user.id if current_user and current_user.is_authenticated else None
         dm = self.get_download_manager()
         self._emit_complete_with_room(
-            item_id, title, file_path, self._key(), user_id,
+            item_id, title, file_path, room_key=self._key(), user_id=user_id,
             dm_instance=dm, dm_key=self._key()
         )
 
     def _emit_error(self, item_id, error):
-        self._emit_error_with_room(item_id, error, self._key())
+        self._emit_error_with_room(item_id, error, room_key=self._key())
 
 
 # ── Singleton instances ──────────────────────────────────────────────
@@ -7,17 +7,82 @@ Simple Python API for calling BTC chord recognition from external applications.
 
 import os
 import sys
-import torch
+import types
+import functools
+import threading
+import contextlib
 import numpy as np
 from pathlib import Path
 
-# Add BTC modules to path
 SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR))
 
-from btc_model import BTC_model
-from utils.hparams import HParams
-from utils.mir_eval_modules import audio_file_to_features, idx2voca_chord
+# torch and the BTC modules are imported on first detector use (see
+# ensure_model_deps), so importing this wrapper stays cheap
+torch = None
+F = None
+BTC_model = None
+HParams = None
+audio_file_to_features = None
+idx2voca_chord = None
+MultiHeadAttention = None
+
+
+def ensure_model_deps():
+    """
+    Import torch and the BTC model modules once, into module globals
+
+    Called automatically when a detector is created; callers can use it up
+    front to check that chord detection can run.
+
+    Raises:
+        ImportError: If torch or the BTC model modules are missing
+    """
+    global torch, F, BTC_model, HParams, audio_file_to_features, idx2voca_chord, MultiHeadAttention
+    if torch is not None:
+        return
+
+    # Add BTC modules to path
+    if str(SCRIPT_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPT_DIR))
+
+    import torch as _torch
+    import torch.nn.functional as _F
+    from btc_model import BTC_model as _BTC_model
+    from utils.hparams import HParams as _HParams
+    from utils.mir_eval_modules import audio_file_to_features as _audio_file_to_features, idx2voca_chord as _idx2voca_chord
+    from utils.transformer_modules import MultiHeadAttention as _MultiHeadAttention
+
+    F = _F
+    BTC_model = _BTC_model
+    HParams = _HParams
+    audio_file_to_features = _audio_file_to_features
+    idx2voca_chord = _idx2voca_chord
+    MultiHeadAttention = _MultiHeadAttention
+    torch = _torch  # set last: marks the imports as complete
+
+
+def _sdpa_attention_forward(self, queries, keys, values):
+    """MultiHeadAttention.forward using the fused scaled_dot_product_attention kernel.
+
+    Same math as the original (queries scaled by depth ** -0.5, additive -inf
+    bias mask, softmax, weighted sum of values). Attention weights are not
+    materialized, so None is returned in their place when attention_map is set.
+    """
+    queries = self._split_heads(self.query_linear(queries))
+    keys = self._split_heads(self.key_linear(keys))
+    values = self._split_heads(self.value_linear(values))
+
+    attn_mask = None
+    if self.bias_mask is not None:
+        attn_mask = self.bias_mask[:, :, :queries.shape[-2], :keys.shape[-2]].to(
+            device=queries.device, dtype=queries.dtype)
+
+    contexts = F.scaled_dot_product_attention(queries, keys, values, attn_mask=attn_mask)
+    outputs = self.output_linear(self._merge_heads(contexts))
+
+    if self.attention_map is True:
+        return outputs, None
+    return outputs
 
 
 class BTCChordDetector:
@@ -32,7 +97,7 @@ class BTCChordDetector:
             print(f"{start:.2f}s - {end:.2f}s: {chord}")
     """
 
-    def __init__(self, model_path=None, use_large_vocab=True, device=None):
+    def __init__(self, model_path=None, use_large_vocab=True, device=None, quantize=None):
         """
         Initialize BTC chord detector
 
@@ -40,9 +105,20 @@ class BTCChordDetector:
             model_path: Path to model file (default: auto-detect)
             use_large_vocab: True for 170 chords, False for 24 chords (default: True)
             device: torch.device or None (default: auto-detect CPU/GPU)
+            quantize: Apply INT8 dynamic quantization to Linear layers
+                (default: True on CPU, False otherwise)
         """
+        ensure_model_deps()
+
         self.use_large_vocab = use_large_vocab
         self.device = device or torch.device("cpu")
+        self.quantize = (self.device.type == "cpu") if quantize is None else quantize
+
+        # Host scratch buffer for model input (page-locked on CUDA), grown on
+        # demand and reused by calls on this (process-wide) detector under
+        # _buffer_lock
+        self._scratch = None
+        self._buffer_lock = threading.Lock()
 
         # Load configuration
         config_path = SCRIPT_DIR / "run_config.yaml"
@@ -86,9 +162,81 @@ class BTCChordDetector:
         # Set to evaluation mode
         self.model.eval()
 
+        # INT8 dynamic quantization of the Linear layers (CPU only); inputs and
+        # mean/std normalization stay FP32, quantized Linears dequantize internally
+        if self.quantize and self.device.type == "cpu":
+            try:
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+                print("✓ Model quantized to INT8 (dynamic)")
+            except Exception as e:
+                print(f"INT8 quantization unavailable, using FP32 model: {e}")
+
+        # Reduced precision on GPU/MPS: BF16 weights where supported (Ampere+),
+        # otherwise FP16 autocast on CUDA and FP16 weights on MPS
+        self._infer_dtype = torch.float32
+        self._autocast_dtype = None
+        if self.device.type == "cuda":
+            if torch.cuda.is_bf16_supported():
+                self.model = self.model.to(torch.bfloat16)
+                self._infer_dtype = torch.bfloat16
+            else:
+                self._autocast_dtype = torch.float16
+        elif self.device.type == "mps":
+            self.model = self.model.to(torch.float16)
+            self._infer_dtype = torch.float16
+
+        # Inference only: swap attention layers onto the fused SDPA kernel (PyTorch 2.0+)
+        if hasattr(F, 'scaled_dot_product_attention'):
+            for module in self.model.modules():
+                if isinstance(module, MultiHeadAttention):
+                    module.forward = types.MethodType(_sdpa_attention_forward, module)
+
+        # Fuse the attention stack and output layer into one compiled graph on
+        # CUDA. The batch (chunk count) varies per song, so the warmup marks
+        # that dimension dynamic and songs of any length reuse this one graph
+        self._forward = self._eager_forward
+        if self.device.type == "cuda" and hasattr(torch, 'compile'):
+            try:
+                fused = torch.compile(self._eager_forward)
+                warmup = torch.zeros((2, self.config.model['timestep'], self.config.model['feature_size']),
+                                     device=self.device, dtype=self._infer_dtype)
+                torch._dynamo.mark_dynamic(warmup, 0)
+                with torch.inference_mode(), self._precision():
+                    fused(warmup)
+                self._forward = fused
+                print("✓ Model compiled with torch.compile")
+            except Exception as e:
+                print(f"torch.compile unavailable, using eager model: {e}")
+
         vocab_size = 170 if self.use_large_vocab else 24
         print(f"✓ Model loaded: {vocab_size} chord vocabulary")
 
+    def _eager_forward(self, chunks):
+        """Self-attention layers followed by the output layer; returns predictions"""
+        self_attn_output, _ = self.model.self_attn_layers(chunks)
+        prediction, _ = self.model.output_layer(self_attn_output)
+        return prediction
+
+    def _precision(self):
+        """Autocast context for the forward pass (no-op unless FP16 autocast is used)"""
+        if self._autocast_dtype is not None:
+            return torch.autocast(device_type=self.device.type, dtype=self._autocast_dtype)
+        return contextlib.nullcontext()
+
+    def _host_buffer(self, rows, cols):
+        """
+        Return a float32 (rows, cols) host tensor to stage model input in
+
+        The tensor is a view of a scratch buffer that is reused across calls and
+        only reallocated when a longer song comes in. On CUDA the buffer is
+        page-locked so the upload can run asynchronously; on CPU it is the model
+        input itself (shares memory with its numpy view, no extra copy).
+        """
+        if self._scratch is None or self._scratch.shape[0] < rows or self._scratch.shape[1] != cols:
+            self._scratch = torch.empty((rows, cols), dtype=torch.float32,
+                                        pin_memory=self.device.type == "cuda")
+        return self._scratch[:rows]
+
     def detect(self, audio_path, return_format='tuples'):
         """
         Detect chords in audio file
@@ -111,32 +259,31 @@ class BTCChordDetector:
         # Extract features
         feature, fps, duration = audio_file_to_features(str(audio_path), self.config)
 
-        # Normalize
-        feature = feature.T
-        feature = (feature - self.mean) / self.std
-
-        # Prepare for model (pad to timestep multiple)
+        # Prepare for model: the transposed features are copied once into a
+        # buffer padded to a timestep multiple, then normalized in place
+        # (padding rows stay 0)
+        n_frames = feature.shape[1]
         n_timestep = self.config.model['timestep']
-        num_pad = n_timestep - (feature.shape[0] % n_timestep)
-        feature = np.pad(feature, ((0, num_pad), (0, 0)), mode="constant", constant_values=0)
-        num_instance = feature.shape[0] // n_timestep
-
-        # Run inference
-        predictions = []
-        with torch.no_grad():
-            feature_tensor = torch.tensor(feature, dtype=torch.float32).unsqueeze(0).to(self.device)
-
-            for t in range(num_instance):
-                chunk = feature_tensor[:, n_timestep * t:n_timestep * (t + 1), :]
-                self_attn_output, _ = self.model.self_attn_layers(chunk)
-                prediction, _ = self.model.output_layer(self_attn_output)
-                preds = prediction.squeeze().cpu().numpy()
-
-                # Handle both single and batch predictions
-                if preds.ndim == 0:
-                    predictions.append(int(preds))
-                else:
-                    predictions.extend(preds.astype(int))
+        num_pad = n_timestep - (n_frames % n_timestep)
+        num_rows = n_frames + num_pad
+        num_instance = num_rows // n_timestep
+
+        # Run inference: all timestep-sized chunks go through the model as one batch
+        with self._buffer_lock:
+            host_tensor = self._host_buffer(num_rows, feature.shape[0])
+            padded = host_tensor.numpy()
+            frames = padded[:n_frames]
+            frames[...] = feature.T
+            padded[n_frames:] = 0
+            np.subtract(frames, self.mean, out=frames)
+            np.divide(frames, self.std, out=frames)
+
+            with torch.inference_mode(), self._precision():
+                # Async H2D copy from pinned memory; .cpu() below syncs before
+                # the buffer can be reused
+                feature_tensor = host_tensor.to(self.device, dtype=self._infer_dtype, non_blocking=True)
+                chunks = feature_tensor.view(num_instance, n_timestep, -1)
+                predictions = self._forward(chunks).reshape(-1).cpu().tolist()
 
         # Convert predictions to time segments
         # fps is actually the time per frame (seconds per feature frame)
@@ -146,21 +293,16 @@ class BTCChordDetector:
         if len(predictions) == 0:
             return segments
 
-        prev_chord = predictions[0]
-        start_time = 0.0
+        # Segment boundaries are the frames where the predicted chord changes
+        preds = np.asarray(predictions, dtype=np.int32)
+        change_idx = np.flatnonzero(np.diff(preds)) + 1
+        boundaries = (np.concatenate(([0], change_idx, [len(preds)])) * time_unit).tolist()
 
-        for i, pred in enumerate(predictions[1:], start=1):
-            if pred != prev_chord:
-                chord_name = self.idx_to_chord[prev_chord]
-                end_time = time_unit * i
-                segments.append((start_time, end_time, chord_name))
-                start_time = end_time
-                prev_chord = pred
+        # Final segment ends at the true duration, not the padded length
+        boundaries[-1] = min(duration, boundaries[-1])
 
-        # Final segment
-        chord_name = self.idx_to_chord[prev_chord]
-        end_time = min(duration, time_unit * len(predictions))
-        segments.append((start_time, end_time, chord_name))
+        chord_names = [self.idx_to_chord[idx] for idx in preds[np.concatenate(([0], change_idx))].tolist()]
+        segments = list(zip([0.0] + boundaries[1:-1], boundaries[1:], chord_names))
 
         # Format output
         if return_format == 'tuples':
@@ -192,12 +334,12 @@ class BTCChordDetector:
 
         # Detect chords
         segments = self.detect(audio_path, return_format='tuples')
+        lab = ''.join([f"{start:.3f} {end:.3f} {chord}\n" for start, end, chord in segments])
 
-        # Write .lab file
+        # Write .lab file in one go
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
-            for start, end, chord in segments:
-                f.write(f"{start:.3f} {end:.3f} {chord}\n")
+        with open(output_path, 'w', newline='') as f:
+            f.write(lab)
 
         print(f"✓ Saved: {output_path}")
         return str(output_path)
@@ -205,6 +347,29 @@ class BTCChordDetector:
 
 # Convenience functions for quick usage
 
+@functools.lru_cache(maxsize=4)
+def _get_detector(model_path, use_large_vocab, device_str):
+    ensure_model_deps()
+    return BTCChordDetector(model_path=model_path, use_large_vocab=use_large_vocab,
+                            device=torch.device(device_str) if device_str else None)
+
+
+def get_detector(model_path=None, use_large_vocab=True, device=None):
+    """
+    Return a shared detector, loading the model only on first use
+
+    Args:
+        model_path: Path to model file (default: auto-detect)
+        use_large_vocab: True for 170 chords, False for 24 chords (default: True)
+        device: torch.device, device string, or None (default: CPU)
+
+    Returns:
+        BTCChordDetector instance cached per (model_path, vocabulary, device)
+    """
+    return _get_detector(str(model_path) if model_path else None, use_large_vocab,
+                         str(device) if device is not None else None)
+
+
 def detect_chords(audio_path, large_vocab=True):
     """
     Quick function to detect chords
@@ -216,7 +381,7 @@ def detect_chords(audio_path, large_vocab=True):
     Returns:
         [(start, end, chord), ...]
     """
-    detector = BTCChordDetector(use_large_vocab=large_vocab)
+    detector = get_detector(use_large_vocab=large_vocab)
     return detector.detect(audio_path)
 
 
@@ -232,7 +397,7 @@ def detect_and_save(audio_path, output_path=None, large_vocab=True):
     Returns:
         Path to saved .lab file
     """
-    detector = BTCChordDetector(use_large_vocab=large_vocab)
+    detector = get_detector(use_large_vocab=large_vocab)
     return detector.detect_and_save(audio_path, output_path)
 
 
@@ -6,30 +6,46 @@ Replaces deprecated np.float and np.int with np.float64 and np.int64.
 import os
 import re
 import sys
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+# Byte prefixes every pattern below needs; files without any are left alone
+_SENTINELS = (b'np.float', b'np.int', b'np.complex', b'np.bool', b'MutableSequence')
+
+# (pattern, replacement) pairs, compiled once for the whole tree walk
+_PATTERNS = [
+    # Replace np.float (but not np.float32, np.float64, etc.)
+    (re.compile(r'\bnp\.float\b(?!\d)'), 'np.float64'),
+    # Replace np.int (but not np.int32, np.int64, etc.)
+    (re.compile(r'\bnp\.int\b(?!\d)'), 'np.int64'),
+    # Replace np.complex (but not np.complex64, np.complex128, etc.)
+    (re.compile(r'\bnp\.complex\b(?!\d)'), 'np.complex128'),
+    # Replace np.bool (but not np.bool_, etc.)
+    (re.compile(r'\bnp\.bool\b(?!_)'), 'np.bool_'),
+    # Fix collections.MutableSequence -> collections.abc.MutableSequence (Python 3.10+)
+    (re.compile(r'from collections import (.*?)MutableSequence'),
+     r'from collections.abc import \1MutableSequence'),
+]
 
 def patch_file(filepath):
     """Patch a single file for numpy and collections compatibility."""
     try:
+        # Most files contain none of the patched tokens: scan the raw bytes
+        # through mmap before decoding anything
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not any(mm.find(token) != -1 for token in _SENTINELS):
+                    return False
+
         with open(filepath, 'r') as f:
             content = f.read()
 
         original = content
 
-        # Replace np.float (but not np.float32, np.float64, etc.)
-        content = re.sub(r'\bnp\.float\b(?!\d)', 'np.float64', content)
-
-        # Replace np.int (but not np.int32, np.int64, etc.)
-        content = re.sub(r'\bnp\.int\b(?!\d)', 'np.int64', content)
-
-        # Replace np.complex (but not np.complex64, np.complex128, etc.)
-        content = re.sub(r'\bnp\.complex\b(?!\d)', 'np.complex128', content)
-
-        # Replace np.bool (but not np.bool_, etc.)
-        content = re.sub(r'\bnp\.bool\b(?!_)', 'np.bool_', content)
-
-        # Fix collections.MutableSequence -> collections.abc.MutableSequence (Python 3.10+)
-        content = re.sub(r'from collections import (.*?)MutableSequence',
-                        r'from collections.abc import \1MutableSequence', content)
+        for pattern, replacement in _PATTERNS:
+            content = pattern.sub(replacement, content)
 
         if content != original:
             with open(filepath, 'w') as f:
@@ -60,15 +76,23 @@ def main():
 
     print(f"Patching madmom at {madmom_path}...")
 
+    paths = [
+        os.path.join(root, filename)
+        for root, dirs, files in os.walk(madmom_path)
+        for filename in files
+        if filename.endswith('.py')
+    ]
+
+    # Files are independent, so patch them in parallel
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(patch_file, paths, chunksize=32))
+
     patched_count = 0
-    for root, dirs, files in os.walk(madmom_path):
-        for filename in files:
-            if filename.endswith('.py'):
-                filepath = os.path.join(root, filename)
-                if patch_file(filepath):
-                    rel_path = os.path.relpath(filepath, madmom_path)
-                    print(f"  ✓ Patched {rel_path}")
-                    patched_count += 1
+    for filepath, patched in zip(paths, results):
+        if patched:
+            rel_path = os.path.relpath(filepath, madmom_path)
+            print(f"  ✓ Patched {rel_path}")
+            patched_count += 1
 
     print(f"\n✅ Patched {patched_count} files")
 
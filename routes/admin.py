@@ -18,7 +18,8 @@ admin_bp = Blueprint('admin', __name__)
 @login_required
 @admin_required
 def admin_page():
-    return render_template('admin.html', users=get_all_users())
+    # The user table is loaded page by page from /api/admin/users
+    return render_template('admin.html')
 
 
 @admin_bp.route('/admin/embedded')
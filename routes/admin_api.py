@@ -18,6 +18,7 @@ from extensions import (
 from core.config import get_setting, update_setting, DOWNLOADS_DIR
 from core.auth_db import (
     get_all_users,
+    get_users_paginated,
     add_user,
     update_user,
     reset_user_password,
@@ -96,11 +97,10 @@ def admin_delete_download_by_video_id(video_id):
 
     try:
         # Find the global download by video_id
-        from core.downloads_db import get_all_downloads_for_admin, delete_download_completely
+        from core.downloads_db import get_download_by_video_id, delete_download_completely
         from core.file_cleanup import delete_download_files
 
-        all_downloads = get_all_downloads_for_admin()
-        download_info = next((d for d in all_downloads if d['video_id'] == video_id), None)
+        download_info = get_download_by_video_id(video_id)
 
         if not download_info:
             return jsonify({'error': f'Download with video_id "{video_id}" not found'}), 404
@@ -148,15 +148,14 @@ def admin_reload_download(video_id):
 
     try:
         from core.downloads_db import (
-            get_all_downloads_for_admin,
+            get_download_by_video_id,
             delete_download_completely,
             get_user_ids_for_video
         )
         from core.file_cleanup import delete_download_files
         from core.aiotube_client import get_aiotube_client
 
-        all_downloads = get_all_downloads_for_admin()
-        download_info = next((d for d in all_downloads if d['video_id'] == video_id), None)
+        download_info = get_download_by_video_id(video_id)
 
         affected_users = []
         file_cleanup_stats = None
@@ -300,12 +299,11 @@ def admin_reset_extraction_by_video_id(video_id):
     try:
         # FIX: Use reset_extraction_status_by_video_id to reset ALL records with this video_id
         # (not just the first one found, which was causing issues when multiple qualities exist)
-        from core.downloads_db import reset_extraction_status_by_video_id, get_all_downloads_for_admin
+        from core.downloads_db import reset_extraction_status_by_video_id, get_downloads_by_video_id
         from core.file_cleanup import delete_extraction_files_only
 
         # Get download info for file cleanup (get all records with this video_id)
-        all_downloads = get_all_downloads_for_admin()
-        matching_downloads = [d for d in all_downloads if d['video_id'] == video_id]
+        matching_downloads = get_downloads_by_video_id(video_id)
 
         if not matching_downloads:
             return jsonify({'error': f'Download with video_id "{video_id}" not found'}), 404
@@ -492,15 +490,21 @@ def admin_bulk_reset_extractions():
 @api_login_required
 @api_admin_required
 def api_get_users():
-    """Get all users (admin only)."""
-    users = get_all_users()
+    """Get users (admin only), optionally paginated with ?limit=&offset=."""
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        users = get_users_paginated(max(min(limit, 500), 1), offset)
+    else:
+        users = get_all_users()
     return jsonify({
         'users': [{
             'id': u['id'],
             'username': u['username'],
             'email': u.get('email'),
             'is_admin': u.get('is_admin', False),
-            'youtube_enabled': bool(u.get('youtube_enabled', False))
+            'youtube_enabled': bool(u.get('youtube_enabled', False)),
+            'created_at': u.get('created_at')
         } for u in users]
     })
 
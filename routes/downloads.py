@@ -133,6 +133,15 @@ def get_all_downloads():
         # Get stems extractor to check for ongoing extractions
         se = user_session_manager.get_stems_extractor()
 
+        # Index active/queued extractions by video_id once instead of rebuilding
+        # the extraction lists for every history row (active wins over queued)
+        ongoing_by_video = {}
+        counts = se.get_extraction_counts()
+        if counts['active'] or counts['queued']:
+            live_extractions = se.get_all_extractions()
+            for extraction in live_extractions['active'] + live_extractions['queued']:
+                ongoing_by_video.setdefault(extraction.video_id, extraction)
+
         for db_item in history_raw:
             # Skip if this video is already in the live session
             if db_item['video_id'] in live_video_ids:
@@ -147,23 +156,13 @@ def get_all_downloads():
             progress = 100.0
             extraction_id = None
 
-            # Check all extraction statuses for a match with this video_id
-            all_active = se.get_all_extractions().get('active', [])
-            all_queued = se.get_all_extractions().get('queued', [])
-
-            # Debug: Log extraction check
-            if all_active or all_queued:
-                logger.debug(f"Checking extractions for video_id={db_item['video_id']}: {len(all_active)} active, {len(all_queued)} queued")
-
-            for extraction in all_active + all_queued:
-                logger.debug(f"  Comparing extraction.video_id='{extraction.video_id}' with db_item video_id='{db_item['video_id']}'")
-                if extraction.video_id == db_item['video_id']:
-                    # Found ongoing extraction for this download
-                    status = extraction.status.value if hasattr(extraction.status, 'value') else str(extraction.status)
-                    progress = extraction.progress
-                    extraction_id = extraction.extraction_id  # Capture extraction_id for DOM element lookup
-                    logger.info(f"Found ongoing extraction for {db_item['video_id']}: extraction_id={extraction_id}, status={status}, progress={progress}")
-                    break
+            extraction = ongoing_by_video.get(db_item['video_id'])
+            if extraction is not None:
+                # Found ongoing extraction for this download
+                status = extraction.status.value if hasattr(extraction.status, 'value') else str(extraction.status)
+                progress = extraction.progress
+                extraction_id = extraction.extraction_id  # Capture extraction_id for DOM element lookup
+                logger.info(f"Found ongoing extraction for {db_item['video_id']}: extraction_id={extraction_id}, status={status}, progress={progress}")
 
             # Map database fields to frontend format
             history.append({
@@ -500,19 +499,7 @@ def delete_download(download_id):
         dm = user_session_manager.get_download_manager()
 
         # Remove from all possible locations
-        removed = False
-        if download_id in dm.queued_downloads:
-            del dm.queued_downloads[download_id]
-            removed = True
-        if download_id in dm.active_downloads:
-            del dm.active_downloads[download_id]
-            removed = True
-        if download_id in dm.failed_downloads:
-            del dm.failed_downloads[download_id]
-            removed = True
-        if download_id in dm.completed_downloads:
-            del dm.completed_downloads[download_id]
-            removed = True
+        removed = dm.remove_download(download_id)
 
         # Also remove from database if user is authenticated
         db_removed = False
@@ -565,19 +552,14 @@ def clear_all_downloads():
         completed_count = len(dm.completed_downloads)
         failed_count = len(dm.failed_downloads)
 
-        dm.queued_downloads.clear()
-        dm.active_downloads.clear()
-        dm.completed_downloads.clear()
-        dm.failed_downloads.clear()
+        dm.clear_downloads()
 
         # Clear all extractions from in-memory manager
         extraction_active_count = len(se.active_extractions)
         extraction_completed_count = len(se.completed_extractions)
         extraction_failed_count = len(se.failed_extractions)
 
-        se.active_extractions.clear()
-        se.completed_extractions.clear()
-        se.failed_extractions.clear()
+        se.clear_extractions()
 
         # Clear database for current user
         if current_user and current_user.is_authenticated:
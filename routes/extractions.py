@@ -11,7 +11,7 @@ from extensions import (
     get_model_display_name,
 )
 from core.logging_config import get_logger, log_with_context
-from core.stems_extractor import ExtractionItem, ExtractionStatus
+from core.stems_extractor import ExtractionItem, ExtractionStatus, write_stems_zip
 from core.downloads_db import (
     list_extractions_for as db_list_extractions,
     find_global_extraction as db_find_global_extraction,
@@ -41,8 +41,9 @@ def get_all_extractions():
         live = []
         live_video_model_pairs = set()  # Track (video_id, model_name) pairs in live session
 
+        all_extractions = se.get_all_extractions()
         for status in ['active', 'queued', 'completed', 'failed']:
-            for item in se.get_all_extractions().get(status, []):
+            for item in all_extractions.get(status, []):
                 live.append({
                     'extraction_id': item.extraction_id,
                     'video_id': item.video_id,
@@ -422,19 +423,7 @@ def delete_extraction(extraction_id):
         print(f"[DEBUG] Queued extractions: {list(se.queued_extractions.keys())}")
 
         # Remove from all possible locations
-        removed = False
-        if extraction_id in se.failed_extractions:
-            del se.failed_extractions[extraction_id]
-            removed = True
-        if extraction_id in se.completed_extractions:
-            del se.completed_extractions[extraction_id]
-            removed = True
-        if extraction_id in se.active_extractions:
-            del se.active_extractions[extraction_id]
-            removed = True
-        if extraction_id in se.queued_extractions:
-            del se.queued_extractions[extraction_id]
-            removed = True
+        removed = se.remove_extraction(extraction_id)
 
         if not removed:
             return jsonify({'error': 'Extraction not found or cannot be deleted'}), 404
@@ -467,17 +456,13 @@ def create_zip_for_extraction(extraction_id):
 
         # Create ZIP file
         try:
-            import zipfile
-
             # Create ZIP file path
             base_name = os.path.splitext(os.path.basename(extraction.audio_path))[0]
             zip_path = os.path.join(extraction.output_dir, f"{base_name}_stems.zip")
 
             # Create ZIP file
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for stem_name, file_path in extraction.output_paths.items():
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, os.path.basename(file_path))
+            write_stems_zip(zip_path, [file_path for file_path in extraction.output_paths.values()
+                                       if os.path.exists(file_path)])
 
             # Update extraction with zip path
             extraction.zip_path = zip_path
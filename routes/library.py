@@ -42,12 +42,7 @@ def remove_download_from_user_list(video_id):
             try:
                 dm = user_session_manager.get_download_manager()
                 # Remove from all session collections that might contain this video_id
-                for collection_name in ['queued_downloads', 'active_downloads', 'failed_downloads', 'completed_downloads']:
-                    collection = getattr(dm, collection_name, {})
-                    keys_to_remove = [k for k, v in collection.items() if hasattr(v, 'video_id') and v.video_id == video_id]
-                    for key in keys_to_remove:
-                        del collection[key]
-                        print(f"[SESSION CLEANUP] Removed {key} from {collection_name}")
+                dm.remove_download_by_video_id(video_id)
             except Exception as session_error:
                 print(f"[SESSION CLEANUP] Warning: {session_error}")
 
@@ -71,12 +66,7 @@ def remove_extraction_from_user_list(video_id):
             try:
                 se = user_session_manager.get_stems_extractor()
                 # Remove from all session collections that might contain this video_id
-                for collection_name in ['queued_extractions', 'active_extractions', 'failed_extractions', 'completed_extractions']:
-                    collection = getattr(se, collection_name, {})
-                    keys_to_remove = [k for k, v in collection.items() if hasattr(v, 'video_id') and v.video_id == video_id]
-                    for key in keys_to_remove:
-                        del collection[key]
-                        print(f"[SESSION CLEANUP] Removed {key} from {collection_name}")
+                se.remove_extraction_by_video_id(video_id)
             except Exception as session_error:
                 print(f"[SESSION CLEANUP] Warning: {session_error}")
 
@@ -187,21 +177,11 @@ def force_remove_download_from_user_list(video_id):
             try:
                 # Clear download manager session data
                 dm = user_session_manager.get_download_manager()
-                for collection_name in ['queued_downloads', 'active_downloads', 'failed_downloads', 'completed_downloads']:
-                    collection = getattr(dm, collection_name, {})
-                    keys_to_remove = [k for k, v in collection.items() if hasattr(v, 'video_id') and v.video_id == video_id]
-                    for key in keys_to_remove:
-                        del collection[key]
-                        print(f"[FORCE CLEANUP] Removed {key} from {collection_name}")
+                dm.remove_download_by_video_id(video_id)
 
                 # Clear extraction manager session data
                 se = user_session_manager.get_stems_extractor()
-                for collection_name in ['queued_extractions', 'active_extractions', 'failed_extractions', 'completed_extractions']:
-                    collection = getattr(se, collection_name, {})
-                    keys_to_remove = [k for k, v in collection.items() if hasattr(v, 'video_id') and v.video_id == video_id]
-                    for key in keys_to_remove:
-                        del collection[key]
-                        print(f"[FORCE CLEANUP] Removed {key} from {collection_name}")
+                se.remove_extraction_by_video_id(video_id)
             except Exception as session_error:
                 print(f"[FORCE CLEANUP] Warning: {session_error}")
 
@@ -142,7 +142,7 @@ function initializeSocketIO() {
     socket.on('extraction_complete', (data) => {
         console.log('Extraction complete:', data);
         updateExtractionComplete(data);
-        // Debounce library refresh to avoid double render with extraction_completed_global
+        // Debounce library refresh to avoid double render with the global extraction_event
         clearTimeout(window._extractionRefreshTimer);
         window._extractionRefreshTimer = setTimeout(() => {
             loadExtractions();
@@ -150,35 +150,30 @@ function initializeSocketIO() {
         }, 500);
     });
 
-    // Handle global extraction completion notifications
-    socket.on('extraction_completed_global', (data) => {
-        console.log('[FRONTEND DEBUG] Global extraction completed event received:', data);
+    // Global extraction notifications, broadcast to all clients
+    const handleGlobalExtraction = (data) => {
+        console.log('[FRONTEND DEBUG] Global extraction event received:', data);
         clearTimeout(window._extractionRefreshTimer);
         window._extractionRefreshTimer = setTimeout(() => {
             try {
                 loadExtractions();
                 loadDownloads();
-                showToast(`New extraction available: ${data.title}`, 'info');
+                showToast(data.message || `New extraction available: ${data.title}`, 'info');
             } catch (error) {
-                console.error('[FRONTEND DEBUG] Error handling global extraction completion:', error);
+                console.error('[FRONTEND DEBUG] Error handling global extraction event:', error);
             }
         }, 500);
-    });
+    };
 
-    // Alternative global extraction refresh event handler
-    socket.on('extraction_refresh_needed', (data) => {
-        console.log('[FRONTEND DEBUG] Extraction refresh needed event received:', data);
-        clearTimeout(window._extractionRefreshTimer);
-        window._extractionRefreshTimer = setTimeout(() => {
-            try {
-                loadExtractions();
-                loadDownloads();
-                showToast(data.message || `New extraction available: ${data.title}`, 'success');
-            } catch (error) {
-                console.error('[FRONTEND DEBUG] Error in backup extraction refresh:', error);
-            }
-        }, 500);
+    socket.on('extraction_event', (data) => {
+        if (data.kind === 'completed' || data.kind === 'refresh') {
+            handleGlobalExtraction(data);
+        }
     });
+
+    // Legacy event names (only sent when legacy_extraction_events is enabled)
+    socket.on('extraction_completed_global', handleGlobalExtraction);
+    socket.on('extraction_refresh_needed', handleGlobalExtraction);
     
     socket.on('extraction_error', (data) => {
         console.error('Extraction error:', data);
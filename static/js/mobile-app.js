@@ -215,19 +215,19 @@ class MobileApp {
         this.socket.on('download_error', (data) => this.onDownloadError(data));
         this.socket.on('extraction_progress', (data) => this.onExtractionProgress(data));
         this.socket.on('extraction_complete', (data) => this.onExtractionComplete(data));
-        this.socket.on('extraction_completed_global', () => {
+        const onGlobalExtraction = () => {
             // Only refresh if no active extraction timer (avoid DOM rebuild mid-extraction)
             if (!this._extractionTimers || Object.keys(this._extractionTimers).length === 0) {
                 clearTimeout(this._extractionRefreshTimer);
                 this._extractionRefreshTimer = setTimeout(() => this.loadLibrary(), 500);
             }
+        };
+        this.socket.on('extraction_event', (data) => {
+            if (data.kind === 'completed' || data.kind === 'refresh') onGlobalExtraction();
         });
-        this.socket.on('extraction_refresh_needed', () => {
-            if (!this._extractionTimers || Object.keys(this._extractionTimers).length === 0) {
-                clearTimeout(this._extractionRefreshTimer);
-                this._extractionRefreshTimer = setTimeout(() => this.loadLibrary(), 500);
-            }
-        });
+        // Legacy event names (only sent when legacy_extraction_events is enabled)
+        this.socket.on('extraction_completed_global', onGlobalExtraction);
+        this.socket.on('extraction_refresh_needed', onGlobalExtraction);
         this.socket.on('extraction_error', (data) => this.onExtractionError(data));
         this.socket.on('lyrics_progress', (data) => this.onLyricsProgress(data));
 